@@ -0,0 +1,26 @@
+"""Optional Numba JIT support.
+
+Kernels are decorated with ``njit`` from here. When numba is not
+installed (``pip install auction-trader[jit]``) the decorator is a no-op
+and kernels run as plain Python with identical results.
+"""
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "HAS_NUMBA"]
@@ -103,6 +103,15 @@ class DatabaseConfig:
     features_db: str = "features.duckdb"
     signals_db: str = "signals.db"
     execution_db: str = "execution.db"
+    sqlite_mmap_size: int = 1 << 30  # Bytes of SQLite file mapped into memory
+    duckdb_memory_limit: Optional[str] = None  # e.g. "4GB"; None = DuckDB default
+    duckdb_threads: Optional[int] = None  # None = DuckDB default (all cores)
+
+
+@dataclass
+class LogConfig:
+    """Logging configuration."""
+    include_reasons: bool = True  # Build human-readable signal reasons
 
 
 @dataclass
@@ -117,6 +126,7 @@ class Config:
     execution: ExecutionConfig = field(default_factory=ExecutionConfig)
     backtest: BacktestConfig = field(default_factory=BacktestConfig)
     database: DatabaseConfig = field(default_factory=DatabaseConfig)
+    log: LogConfig = field(default_factory=LogConfig)
 
     @classmethod
     def from_dict(cls, data: dict) -> "Config":
@@ -132,6 +142,7 @@ class Config:
             "execution": config.execution,
             "backtest": config.backtest,
             "database": config.database,
+            "log": config.log,
         }
         for section_name, section_obj in section_mapping.items():
             if section_name in data:
@@ -152,6 +163,7 @@ class Config:
             "execution": self.execution.__dict__.copy(),
             "backtest": self.backtest.__dict__.copy(),
             "database": self.database.__dict__.copy(),
+            "log": self.log.__dict__.copy(),
         }
 
 
@@ -0,0 +1,46 @@
+"""Numba kernels over the core data types.
+
+Kept apart from types so that importing the data types does not load
+numba; AcceptanceStateArray.update imports this module on first use.
+"""
+
+import numpy as np
+
+from .._jit import njit
+from .types import ts_to_minute
+
+
+@njit(cache=True, boundscheck=False)
+def update_acceptance_batch(
+    closes, vahs, vals, above_counts, below_counts, locked_vah, locked_val,
+):
+    """Advance acceptance state for N symbols by one bar, in place.
+
+    Row i mirrors SignalEngine._update_acceptance for symbol i: a close
+    above VAH extends the above sequence (locking VAH when it starts) and
+    clears the below one, and vice versa; a close inside the VA clears both.
+    """
+    for i in range(closes.shape[0]):
+        if closes[i] > vahs[i]:
+            if above_counts[i] == 0:
+                locked_vah[i] = vahs[i]
+            above_counts[i] += 1
+            below_counts[i] = 0
+            locked_val[i] = np.nan
+        elif closes[i] < vals[i]:
+            if below_counts[i] == 0:
+                locked_val[i] = vals[i]
+            below_counts[i] += 1
+            above_counts[i] = 0
+            locked_vah[i] = np.nan
+        else:
+            above_counts[i] = 0
+            below_counts[i] = 0
+            locked_vah[i] = np.nan
+            locked_val[i] = np.nan
+
+
+# Compiled twin for calls from inside @njit kernels, where it inlines to
+# two integer ops. Python callers keep ts_to_minute, which is cheaper than
+# going through numba's dispatcher for a single value.
+ts_to_minute_jit = njit(cache=True)(ts_to_minute)
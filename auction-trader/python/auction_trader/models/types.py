@@ -5,6 +5,8 @@ from enum import Enum, auto
 from typing import Optional
 import time
 
+import numpy as np
+
 
 class TradeSide(Enum):
     """Inferred trade side from bid/ask alignment."""
@@ -18,35 +20,46 @@ class TradeSide(Enum):
 
 
 class SignalType(Enum):
-    """Trading signal types."""
-    BREAKIN_LONG = auto()
-    BREAKIN_SHORT = auto()
-    BREAKOUT_LONG = auto()
-    BREAKOUT_SHORT = auto()
-    FAILED_BREAKOUT_LONG = auto()
-    FAILED_BREAKOUT_SHORT = auto()
+    """Trading signal types.
+
+    Values are chosen so the low bit gives direction: even = long,
+    odd = short.
+    """
+    BREAKIN_LONG = 0
+    BREAKIN_SHORT = 1
+    BREAKOUT_LONG = 2
+    BREAKOUT_SHORT = 3
+    FAILED_BREAKOUT_LONG = 4
+    FAILED_BREAKOUT_SHORT = 5
 
     def is_long(self) -> bool:
-        return self in (
-            SignalType.BREAKIN_LONG,
-            SignalType.BREAKOUT_LONG,
-            SignalType.FAILED_BREAKOUT_LONG,
-        )
+        return (self.value & 1) == 0
 
     def is_short(self) -> bool:
-        return not self.is_long()
+        return (self.value & 1) == 1
 
     @property
     def priority(self) -> int:
         """Get priority (lower = higher priority).
         Break-in (1) > Failed breakout (2) > Breakout (3)
         """
-        if self in (SignalType.BREAKIN_LONG, SignalType.BREAKIN_SHORT):
-            return 1
-        elif self in (SignalType.FAILED_BREAKOUT_LONG, SignalType.FAILED_BREAKOUT_SHORT):
-            return 2
-        else:
-            return 3
+        return _PRIORITY[self.value]
+
+
+# SignalType priority, indexed by SignalType.value
+_PRIORITY = (
+    1,  # BREAKIN_LONG
+    1,  # BREAKIN_SHORT
+    3,  # BREAKOUT_LONG
+    3,  # BREAKOUT_SHORT
+    2,  # FAILED_BREAKOUT_LONG
+    2,  # FAILED_BREAKOUT_SHORT
+)
+
+
+def signal_priority(signal_type: SignalType) -> int:
+    """Get a signal type's priority (lower = higher priority)."""
+    return _PRIORITY[signal_type.value]
 
 
 class Action(Enum):
@@ -67,7 +80,7 @@ class PositionSide(Enum):
         return 1.0 if self == PositionSide.LONG else -1.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Trade:
     """A single trade from the exchange."""
     ts_ms: int
@@ -75,7 +88,7 @@ class Trade:
     size: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Quote:
     """A Level 1 quote (best bid/ask)."""
     ts_ms: int
@@ -102,6 +115,28 @@ class Quote:
             return (self.bid_sz - self.ask_sz) / total
         return 0.0
 
+    # Column-wise versions of the properties above, for arrays of quotes
+
+    @staticmethod
+    def batch_mid(bid_px: np.ndarray, ask_px: np.ndarray) -> np.ndarray:
+        """Calculate mid prices for bid/ask price arrays."""
+        return (bid_px + ask_px) / 2
+
+    @staticmethod
+    def batch_spread(bid_px: np.ndarray, ask_px: np.ndarray) -> np.ndarray:
+        """Calculate spreads for bid/ask price arrays."""
+        return ask_px - bid_px
+
+    @staticmethod
+    def batch_imbalance(bid_sz: np.ndarray, ask_sz: np.ndarray) -> np.ndarray:
+        """Calculate quote imbalances for bid/ask size arrays (0 where empty)."""
+        bid_sz = np.asarray(bid_sz, dtype=np.float64)
+        ask_sz = np.asarray(ask_sz, dtype=np.float64)
+        total = bid_sz + ask_sz
+        return np.divide(
+            bid_sz - ask_sz, total, out=np.zeros_like(total), where=total > 0
+        )
+
 
 @dataclass
 class ClassifiedTrade:
@@ -118,7 +153,7 @@ class ClassifiedTrade:
         return self.trade.size * self.side.sign
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Bar1m:
     """1-minute OHLCV bar with L1 snapshot at close."""
     ts_min: int
@@ -153,7 +188,7 @@ class Bar1m:
         return 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ValueArea:
     """Value Area output."""
     poc: float
@@ -167,20 +202,23 @@ class ValueArea:
 
     @staticmethod
     def invalid() -> "ValueArea":
-        """Create an invalid/empty VA."""
-        return ValueArea(
-            poc=0.0,
-            vah=0.0,
-            val=0.0,
-            coverage=0.0,
-            bin_count=0,
-            total_volume=0.0,
-            bin_width=0.0,
-            is_valid=False,
-        )
+        """Get the shared invalid/empty VA (immutable, so safe to share)."""
+        return _INVALID_VALUE_AREA
 
 
-@dataclass
+_INVALID_VALUE_AREA = ValueArea(
+    poc=0.0,
+    vah=0.0,
+    val=0.0,
+    coverage=0.0,
+    bin_count=0,
+    total_volume=0.0,
+    bin_width=0.0,
+    is_valid=False,
+)
+
+
+@dataclass(slots=True, frozen=True)
 class OrderFlowMetrics:
     """Order flow metrics for a 1-minute period."""
     of_1m: float
@@ -196,7 +234,7 @@ class OrderFlowMetrics:
         return self.ambiguous_frac > threshold
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Features1m:
     """Complete feature set for a 1-minute period."""
     ts_min: int
@@ -210,7 +248,7 @@ class Features1m:
     spread_avg_60m: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Signal:
     """Trading signal from the signal engine."""
     ts_min: int
@@ -226,7 +264,7 @@ class Signal:
     features_snapshot: Optional[Features1m] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """An open position."""
     entry_ts: int
@@ -241,12 +279,15 @@ class Position:
     strategy_tag: str = ""
     fees_paid: float = 0.0
     funding_paid: float = 0.0
+    # +1.0 long / -1.0 short, cached from side
+    _side_sign: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._side_sign = self.side.sign
 
     def unrealized_pnl(self, current_price: float) -> float:
         """Calculate unrealized P&L at current price."""
-        price_diff = current_price - self.entry_price
-        if self.side == PositionSide.SHORT:
-            price_diff = -price_diff
+        price_diff = (current_price - self.entry_price) * self._side_sign
         return price_diff * self.size - self.fees_paid - self.funding_paid
 
     def is_profitable(self, current_price: float, min_profit: float = 0.0) -> bool:
@@ -254,7 +295,7 @@ class Position:
         return self.unrealized_pnl(current_price) > min_profit
 
 
-@dataclass
+@dataclass(slots=True)
 class AcceptanceState:
     """State for tracking acceptance sequences."""
     # Breakout acceptance tracking
@@ -279,6 +320,62 @@ class AcceptanceState:
         self.sequence_start_ts = None
 
 
+class AcceptanceStateArray:
+    """Acceptance state for many symbols, one array per field.
+
+    Row i holds the state for symbol i, so resets across symbols are a
+    single masked write. Unlocked boundaries are NaN. sequence_start_ts
+    is not tracked since nothing reads it.
+    """
+
+    __slots__ = (
+        "consecutive_above_vah",
+        "consecutive_below_val",
+        "locked_vah",
+        "locked_val",
+    )
+
+    def __init__(self, n: int):
+        self.consecutive_above_vah = np.zeros(n, dtype=np.int64)
+        self.consecutive_below_val = np.zeros(n, dtype=np.int64)
+        self.locked_vah = np.full(n, np.nan)
+        self.locked_val = np.full(n, np.nan)
+
+    def __len__(self) -> int:
+        return self.consecutive_above_vah.shape[0]
+
+    def reset_above(self, mask: np.ndarray) -> None:
+        """Reset above VAH sequences for rows selected by mask."""
+        self.consecutive_above_vah[mask] = 0
+        self.locked_vah[mask] = np.nan
+
+    def reset_below(self, mask: np.ndarray) -> None:
+        """Reset below VAL sequences for rows selected by mask."""
+        self.consecutive_below_val[mask] = 0
+        self.locked_val[mask] = np.nan
+
+    def update(self, closes: np.ndarray, vahs: np.ndarray, vals: np.ndarray) -> None:
+        """Advance every row by one bar (see kernels.update_acceptance_batch)."""
+        from .kernels import update_acceptance_batch
+
+        update_acceptance_batch(
+            closes, vahs, vals,
+            self.consecutive_above_vah, self.consecutive_below_val,
+            self.locked_vah, self.locked_val,
+        )
+
+    def state(self, i: int) -> AcceptanceState:
+        """Copy row i out as an AcceptanceState."""
+        locked_vah = self.locked_vah[i]
+        locked_val = self.locked_val[i]
+        return AcceptanceState(
+            consecutive_above_vah=int(self.consecutive_above_vah[i]),
+            consecutive_below_val=int(self.consecutive_below_val[i]),
+            locked_vah=None if np.isnan(locked_vah) else float(locked_vah),
+            locked_val=None if np.isnan(locked_val) else float(locked_val),
+        )
+
+
 def ts_to_minute(ts_ms: int) -> int:
     """Convert timestamp to minute boundary."""
     return (ts_ms // 60_000) * 60_000
@@ -286,4 +383,4 @@ def ts_to_minute(ts_ms: int) -> int:
 
 def current_ts_ms() -> int:
     """Get current timestamp in milliseconds."""
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
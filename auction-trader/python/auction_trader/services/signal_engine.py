@@ -6,10 +6,13 @@ Three core setups:
 3. Failed Breakout: Fakeout reversal back into value
 """
 
+from collections import namedtuple
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional, List, Mapping, Sequence, Tuple
 from enum import Enum
 
+import numpy as np
+
 from ..config import Config, SignalConfig, OrderFlowConfig
 from ..models.types import (
     Features1m,
@@ -19,8 +22,51 @@ from ..models.types import (
     ValueArea,
     OrderFlowMetrics,
     AcceptanceState,
+    signal_priority,
+)
+
+
+# Signal type codes emitted by the backtest kernel (-1 = HOLD); each code
+# is the SignalType value, so BACKTEST_SIGNAL_TYPES[code].value == code
+BACKTEST_SIGNAL_TYPES = (
+    SignalType.BREAKIN_LONG,
+    SignalType.BREAKIN_SHORT,
+    SignalType.BREAKOUT_LONG,
+    SignalType.BREAKOUT_SHORT,
+    SignalType.FAILED_BREAKOUT_LONG,
+    SignalType.FAILED_BREAKOUT_SHORT,
+)
+
+# Feature columns consumed by the backtest kernel (features_1m names)
+BACKTEST_COLUMNS = (
+    "ts_min",
+    "mid_close",
+    "va_poc",
+    "va_vah",
+    "va_val",
+    "va_is_valid",
+    "of_1m",
+    "of_norm_1m",
+    "qimb_ema",
 )
 
+# Scalar thresholds passed to the backtest kernel
+_KernelParams = namedtuple("_KernelParams", [
+    "accept_outside_k",
+    "cooldown_ms",
+    "stop_buffer",
+    "use_qimb",
+    "of_entry_min",
+    "of_entry_min_norm",
+    "qimb_entry_min",
+    "of_breakout_min",
+    "of_breakout_min_norm",
+    "qimb_breakout_min",
+    "of_fail_max",
+    "of_fail_max_norm",
+    "qimb_fail_max",
+])
+
 
 class PriceZone(Enum):
     """Price location relative to Value Area."""
@@ -29,7 +75,7 @@ class PriceZone(Enum):
     BELOW_VAL = "below"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SignalCandidate:
     """A potential signal before priority resolution."""
     signal_type: SignalType
@@ -57,6 +103,9 @@ class SignalEngine:
         self.of_config = config.order_flow
         self.risk_config = config.risk
 
+        # Skip reason string formatting when reasons are not logged
+        self._build_reasons = config.log.include_reasons
+
         # Acceptance tracking state
         self.acceptance = AcceptanceState()
 
@@ -64,8 +113,20 @@ class SignalEngine:
         self.prev_features: Optional[Features1m] = None
         self.prev_zone: Optional[PriceZone] = None
 
-        # Cooldown tracking
-        self.last_signal_ts: Optional[int] = None
+        # Cooldown tracking (absolute deadline, 0 = no prior signal)
+        self._cooldown_ms = self.risk_config.cooldown_minutes * 60_000
+        self._cooldown_until_ts = 0
+        self._last_signal_ts: Optional[int] = None
+
+    @property
+    def last_signal_ts(self) -> Optional[int]:
+        """Timestamp of the last emitted signal."""
+        return self._last_signal_ts
+
+    @last_signal_ts.setter
+    def last_signal_ts(self, ts: Optional[int]) -> None:
+        self._last_signal_ts = ts
+        self._cooldown_until_ts = 0 if ts is None else ts + self._cooldown_ms
 
     def process(self, features: Features1m) -> Signal:
         """Process features and generate signal.
@@ -116,9 +177,8 @@ class SignalEngine:
         if not candidates:
             return self._hold_signal(features, "No setup detected")
 
-        # Sort by priority (lower = higher priority)
-        candidates.sort(key=lambda c: c.signal_type.priority)
-        winner = candidates[0]
+        # Pick highest priority candidate (lower = higher priority)
+        winner = min(candidates, key=lambda c: signal_priority(c.signal_type))
 
         # Record signal time for cooldown
         self.last_signal_ts = features.ts_min
@@ -196,7 +256,10 @@ class SignalEngine:
                     stop_price=va.val - self._stop_buffer(features),
                     tp1_price=va.poc,
                     tp2_price=va.vah,
-                    reason=f"Break-in long: price returned to VA from below VAL={va.val:.2f}",
+                    reason=(
+                        f"Break-in long: price returned to VA from below VAL={va.val:.2f}"
+                        if self._build_reasons else ""
+                    ),
                 )
 
         # Short Break-in: Was above VAH, now inside VA
@@ -207,7 +270,10 @@ class SignalEngine:
                     stop_price=va.vah + self._stop_buffer(features),
                     tp1_price=va.poc,
                     tp2_price=va.val,
-                    reason=f"Break-in short: price returned to VA from above VAH={va.vah:.2f}",
+                    reason=(
+                        f"Break-in short: price returned to VA from above VAH={va.vah:.2f}"
+                        if self._build_reasons else ""
+                    ),
                 )
 
         return None
@@ -235,7 +301,10 @@ class SignalEngine:
                     stop_price=va.val - self._stop_buffer(features),
                     tp1_price=va.poc,
                     tp2_price=va.vah,
-                    reason=f"Failed breakout long: {self.acceptance.consecutive_below_val} bars below VAL, now returning",
+                    reason=(
+                        f"Failed breakout long: {self.acceptance.consecutive_below_val} bars below VAL, now returning"
+                        if self._build_reasons else ""
+                    ),
                 )
 
         # Short Failed Breakout: Was above VAH (1 to k-1 bars), now inside
@@ -249,7 +318,10 @@ class SignalEngine:
                     stop_price=va.vah + self._stop_buffer(features),
                     tp1_price=va.poc,
                     tp2_price=va.val,
-                    reason=f"Failed breakout short: {self.acceptance.consecutive_above_vah} bars above VAH, now returning",
+                    reason=(
+                        f"Failed breakout short: {self.acceptance.consecutive_above_vah} bars above VAH, now returning"
+                        if self._build_reasons else ""
+                    ),
                 )
 
         return None
@@ -278,7 +350,10 @@ class SignalEngine:
                     stop_price=stop_ref - self._stop_buffer(features),
                     tp1_price=features.mid_close + (features.mid_close - stop_ref),  # 1R
                     tp2_price=features.mid_close + 2 * (features.mid_close - stop_ref),  # 2R
-                    reason=f"Breakout long: {self.acceptance.consecutive_above_vah} bars above VAH (accepted)",
+                    reason=(
+                        f"Breakout long: {self.acceptance.consecutive_above_vah} bars above VAH (accepted)"
+                        if self._build_reasons else ""
+                    ),
                     confidence=0.9,  # Slightly lower confidence for breakouts
                 )
 
@@ -294,7 +369,10 @@ class SignalEngine:
                     stop_price=stop_ref + self._stop_buffer(features),
                     tp1_price=features.mid_close - (stop_ref - features.mid_close),  # 1R
                     tp2_price=features.mid_close - 2 * (stop_ref - features.mid_close),  # 2R
-                    reason=f"Breakout short: {self.acceptance.consecutive_below_val} bars below VAL (accepted)",
+                    reason=(
+                        f"Breakout short: {self.acceptance.consecutive_below_val} bars below VAL (accepted)"
+                        if self._build_reasons else ""
+                    ),
                     confidence=0.9,
                 )
 
@@ -414,11 +492,7 @@ class SignalEngine:
 
     def _in_cooldown(self, current_ts: int) -> bool:
         """Check if we're in cooldown period."""
-        if self.last_signal_ts is None:
-            return False
-
-        cooldown_ms = self.risk_config.cooldown_minutes * 60_000
-        return (current_ts - self.last_signal_ts) < cooldown_ms
+        return current_ts < self._cooldown_until_ts
 
     def _hold_signal(self, features: Features1m, reason: str) -> Signal:
         """Generate a HOLD signal."""
@@ -436,3 +510,90 @@ class SignalEngine:
         self.prev_features = None
         self.prev_zone = None
         self.last_signal_ts = None
+
+    def run_backtest(
+        self, features: Mapping[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Run the signal logic over a whole feature history in one kernel call.
+
+        Equivalent to calling process() bar by bar from a fresh state, but
+        operates on column arrays instead of Features1m objects. Engine
+        state is left untouched. Reasons are not produced.
+
+        Args:
+            features: Column arrays keyed by BACKTEST_COLUMNS names
+                (see features_to_arrays)
+
+        Returns:
+            (signal_type, stop_price, tp1_price, tp2_price) arrays. Signal
+            type codes are SignalType values (and index
+            BACKTEST_SIGNAL_TYPES), -1 means HOLD; prices are NaN on HOLD
+            bars.
+        """
+        from .signal_kernels import run_signal_kernel
+
+        ts = np.ascontiguousarray(features["ts_min"], dtype=np.int64)
+        n = ts.shape[0]
+
+        out_sig = np.full(n, -1, dtype=np.int8)
+        out_stop = np.full(n, np.nan)
+        out_tp1 = np.full(n, np.nan)
+        out_tp2 = np.full(n, np.nan)
+
+        run_signal_kernel(
+            ts,
+            np.ascontiguousarray(features["mid_close"], dtype=np.float64),
+            np.ascontiguousarray(features["va_poc"], dtype=np.float64),
+            np.ascontiguousarray(features["va_vah"], dtype=np.float64),
+            np.ascontiguousarray(features["va_val"], dtype=np.float64),
+            np.ascontiguousarray(features["va_is_valid"], dtype=np.bool_),
+            np.ascontiguousarray(features["of_1m"], dtype=np.float64),
+            np.ascontiguousarray(features["of_norm_1m"], dtype=np.float64),
+            np.ascontiguousarray(features["qimb_ema"], dtype=np.float64),
+            self._kernel_params(),
+            out_sig,
+            out_stop,
+            out_tp1,
+            out_tp2,
+        )
+        return out_sig, out_stop, out_tp1, out_tp2
+
+    def _kernel_params(self) -> _KernelParams:
+        """Collect config thresholds as plain scalars for the kernel."""
+        sc = self.signal_config
+        oc = self.of_config
+        return _KernelParams(
+            accept_outside_k=int(sc.accept_outside_k),
+            cooldown_ms=int(self._cooldown_ms),
+            stop_buffer=float(
+                self.risk_config.stop_buffer_ticks * self.config.instrument.tick_size
+            ),
+            use_qimb=bool(oc.use_qimb),
+            of_entry_min=float(sc.of_entry_min),
+            of_entry_min_norm=float(sc.of_entry_min_norm),
+            qimb_entry_min=float(oc.qimb_entry_min),
+            of_breakout_min=float(sc.of_breakout_min),
+            of_breakout_min_norm=float(sc.of_breakout_min_norm),
+            qimb_breakout_min=float(oc.qimb_breakout_min),
+            of_fail_max=float(sc.of_fail_max),
+            of_fail_max_norm=float(sc.of_fail_max_norm),
+            qimb_fail_max=float(oc.qimb_fail_max),
+        )
+
+
+def features_to_arrays(features: Sequence[Features1m]) -> dict:
+    """Convert a feature history to the column arrays used by run_backtest."""
+    n = len(features)
+    return {
+        "ts_min": np.fromiter((f.ts_min for f in features), np.int64, n),
+        "mid_close": np.fromiter((f.mid_close for f in features), np.float64, n),
+        "va_poc": np.fromiter((f.va.poc for f in features), np.float64, n),
+        "va_vah": np.fromiter((f.va.vah for f in features), np.float64, n),
+        "va_val": np.fromiter((f.va.val for f in features), np.float64, n),
+        "va_is_valid": np.fromiter((f.va.is_valid for f in features), np.bool_, n),
+        "of_1m": np.fromiter((f.order_flow.of_1m for f in features), np.float64, n),
+        "of_norm_1m": np.fromiter(
+            (f.order_flow.of_norm_1m for f in features), np.float64, n
+        ),
+        "qimb_ema": np.fromiter((f.qimb_ema for f in features), np.float64, n),
+    }
@@ -0,0 +1,154 @@
+"""Numba kernel behind SignalEngine.run_backtest.
+
+Kept apart from signal_engine so that importing the engine does not load
+numba; run_backtest imports this module on first use.
+"""
+
+import numpy as np
+
+from .._jit import njit
+
+
+# Zone codes (mirror PriceZone)
+_ZONE_NONE = -1
+_ZONE_INSIDE = 0
+_ZONE_ABOVE = 1
+_ZONE_BELOW = 2
+
+
+@njit(cache=True)
+def _of_ok(of_1m, of_norm, qimb, of_thr, of_norm_thr, qimb_thr, use_qimb, is_long):
+    """Order flow condition, mirrors SignalEngine._check_of_condition."""
+    if is_long:
+        of_ok = of_1m >= of_thr or of_norm >= of_norm_thr
+        qimb_ok = (not use_qimb) or qimb >= qimb_thr
+    else:
+        of_ok = of_1m <= -of_thr or of_norm <= -of_norm_thr
+        qimb_ok = (not use_qimb) or qimb <= -qimb_thr
+    return of_ok and qimb_ok
+
+
+@njit(cache=True, boundscheck=False)
+def run_signal_kernel(
+    ts, mid, poc, vah, val, va_valid, of_1m, of_norm, qimb, p,
+    out_sig, out_stop, out_tp1, out_tp2,
+):
+    """Per-bar signal loop replicating SignalEngine.process.
+
+    Writes signal codes (SignalType values, -1 = HOLD) and stop/target
+    prices into the output arrays.
+    """
+    k = p.accept_outside_k
+    buf = p.stop_buffer
+
+    # Acceptance state (NaN = no locked boundary)
+    above = 0
+    below = 0
+    locked_vah = np.nan
+    locked_val = np.nan
+    prev_zone = _ZONE_NONE
+    cooldown_until = 0
+
+    for i in range(ts.shape[0]):
+        if not va_valid[i]:
+            continue
+        if ts[i] < cooldown_until:
+            continue
+
+        m = mid[i]
+        if m > vah[i]:
+            zone = _ZONE_ABOVE
+        elif m < val[i]:
+            zone = _ZONE_BELOW
+        else:
+            zone = _ZONE_INSIDE
+
+        # Update acceptance
+        if zone == _ZONE_ABOVE:
+            if above == 0:
+                locked_vah = vah[i]
+            above += 1
+            below = 0
+            locked_val = np.nan
+        elif zone == _ZONE_BELOW:
+            if below == 0:
+                locked_val = val[i]
+            below += 1
+            above = 0
+            locked_vah = np.nan
+        else:
+            above = 0
+            below = 0
+            locked_vah = np.nan
+            locked_val = np.nan
+
+        # Checks run in priority order; the first hit wins
+        sig = -1
+        stop = np.nan
+        tp1 = np.nan
+        tp2 = np.nan
+
+        # Break-in
+        if prev_zone == _ZONE_BELOW and zone == _ZONE_INSIDE:
+            if _of_ok(of_1m[i], of_norm[i], qimb[i], p.of_entry_min,
+                      p.of_entry_min_norm, p.qimb_entry_min, p.use_qimb, True):
+                sig = 0
+                stop = val[i] - buf
+                tp1 = poc[i]
+                tp2 = vah[i]
+        if sig < 0 and prev_zone == _ZONE_ABOVE and zone == _ZONE_INSIDE:
+            if _of_ok(of_1m[i], of_norm[i], qimb[i], p.of_entry_min,
+                      p.of_entry_min_norm, p.qimb_entry_min, p.use_qimb, False):
+                sig = 1
+                stop = vah[i] + buf
+                tp1 = poc[i]
+                tp2 = val[i]
+
+        # Failed breakout
+        if (sig < 0 and zone == _ZONE_INSIDE and prev_zone == _ZONE_BELOW
+                and 1 <= below < k):
+            if _of_ok(of_1m[i], of_norm[i], qimb[i], p.of_fail_max,
+                      p.of_fail_max_norm, p.qimb_fail_max, p.use_qimb, True):
+                sig = 4
+                stop = val[i] - buf
+                tp1 = poc[i]
+                tp2 = vah[i]
+        if (sig < 0 and zone == _ZONE_INSIDE and prev_zone == _ZONE_ABOVE
+                and 1 <= above < k):
+            if _of_ok(of_1m[i], of_norm[i], qimb[i], p.of_fail_max,
+                      p.of_fail_max_norm, p.qimb_fail_max, p.use_qimb, False):
+                sig = 5
+                stop = vah[i] + buf
+                tp1 = poc[i]
+                tp2 = val[i]
+
+        # Breakout
+        if sig < 0 and zone == _ZONE_ABOVE and above >= k:
+            if _of_ok(of_1m[i], of_norm[i], qimb[i], p.of_breakout_min,
+                      p.of_breakout_min_norm, p.qimb_breakout_min, p.use_qimb, True):
+                ref = locked_vah
+                if np.isnan(ref) or ref == 0.0:
+                    ref = vah[i]
+                sig = 2
+                stop = ref - buf
+                tp1 = m + (m - ref)
+                tp2 = m + 2 * (m - ref)
+        if sig < 0 and zone == _ZONE_BELOW and below >= k:
+            if _of_ok(of_1m[i], of_norm[i], qimb[i], p.of_breakout_min,
+                      p.of_breakout_min_norm, p.qimb_breakout_min, p.use_qimb, False):
+                ref = locked_val
+                if np.isnan(ref) or ref == 0.0:
+                    ref = val[i]
+                sig = 3
+                stop = ref + buf
+                tp1 = m - (ref - m)
+                tp2 = m - 2 * (ref - m)
+
+        prev_zone = zone
+
+        if sig >= 0:
+            out_sig[i] = sig
+            out_stop[i] = stop
+            out_tp1[i] = tp1
+            out_tp2[i] = tp2
+            cooldown_until = ts[i] + p.cooldown_ms
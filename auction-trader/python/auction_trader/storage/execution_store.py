@@ -5,13 +5,20 @@ Stores:
 - Trade history
 - Order tracking
 - Daily P&L
+
+Requires SQLite >= 3.35 for INSERT ... RETURNING (check with
+sqlite3.sqlite_version).
 """
 
 import logging
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
+from typing import Iterator, Optional, List
 
 from ..config import DatabaseConfig
 from ..models.types import Position, PositionSide
@@ -19,6 +26,107 @@ from ..services.position_manager import TradeRecord, ExitReason
 
 logger = logging.getLogger(__name__)
 
+# Hot-path statements, kept as constants so sqlite3's statement cache hits
+# Upsert in place; updated_at falls back to its DEFAULT on first insert
+_SQL_SAVE_POS = """
+    INSERT INTO positions (
+        symbol, entry_ts, side, entry_price, size, original_size,
+        stop_price, tp1_price, tp2_price, tp1_hit, strategy_tag,
+        fees_paid, funding_paid
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (symbol) DO UPDATE SET
+        entry_ts = excluded.entry_ts,
+        side = excluded.side,
+        entry_price = excluded.entry_price,
+        size = excluded.size,
+        original_size = excluded.original_size,
+        stop_price = excluded.stop_price,
+        tp1_price = excluded.tp1_price,
+        tp2_price = excluded.tp2_price,
+        tp1_hit = excluded.tp1_hit,
+        strategy_tag = excluded.strategy_tag,
+        fees_paid = excluded.fees_paid,
+        funding_paid = excluded.funding_paid,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_SQL_INSERT_TRADE = """
+    INSERT INTO trades (
+        symbol, entry_ts, exit_ts, side, entry_price, exit_price,
+        size, pnl_gross, pnl_net, fees, funding, exit_reason,
+        strategy_tag, hold_minutes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING id
+"""
+
+_SQL_UPSERT_DAILY = """
+    INSERT INTO daily_pnl (
+        date, symbol, realized_pnl, trades_count, win_count, loss_count,
+        fees_total, funding_total, winner_pnl_sum, loser_pnl_sum, hold_min_sum
+    )
+    VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date, symbol) DO UPDATE SET
+        realized_pnl = realized_pnl + excluded.realized_pnl,
+        trades_count = trades_count + 1,
+        win_count = win_count + excluded.win_count,
+        loss_count = loss_count + excluded.loss_count,
+        fees_total = fees_total + excluded.fees_total,
+        funding_total = funding_total + excluded.funding_total,
+        winner_pnl_sum = winner_pnl_sum + excluded.winner_pnl_sum,
+        loser_pnl_sum = loser_pnl_sum + excluded.loser_pnl_sum,
+        hold_min_sum = hold_min_sum + excluded.hold_min_sum
+"""
+
+# Trade statistics served from the daily_pnl rollup (O(days), not O(trades))
+_SQL_TRADE_STATS_ROLLUP = """
+    SELECT
+        SUM(trades_count) as total_trades,
+        SUM(win_count) as winners,
+        SUM(loss_count) as losers,
+        SUM(realized_pnl) as total_pnl,
+        SUM(realized_pnl) / NULLIF(SUM(trades_count), 0) as avg_pnl,
+        SUM(winner_pnl_sum) / NULLIF(SUM(win_count), 0) as avg_winner,
+        SUM(loser_pnl_sum) / NULLIF(SUM(loss_count), 0) as avg_loser,
+        SUM(fees_total) as total_fees,
+        SUM(funding_total) as total_funding,
+        CAST(SUM(hold_min_sum) AS REAL) / NULLIF(SUM(trades_count), 0) as avg_hold_minutes
+    FROM daily_pnl
+    WHERE symbol = ?
+"""
+
+_SQL_EQUITY_CURVE = """
+    SELECT exit_ts, ? + SUM(pnl_net) OVER (ORDER BY exit_ts, id)
+    FROM trades WHERE symbol = ?
+    ORDER BY exit_ts, id
+"""
+
+_MS_PER_DAY = 86_400_000
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=1024)
+def _day_to_date_str(day: int) -> str:
+    """Format a UTC day index (days since epoch) as YYYY-MM-DD."""
+    return date.fromordinal(_EPOCH_ORDINAL + day).isoformat()
+
+
+# Idle read-only connections kept open for reuse
+_READ_POOL_SIZE = 4
+
+# Committed writes between explicit WAL truncations
+_CHECKPOINT_EVERY = 1000
+
+# connect() re-runs ANALYZE once the trades row count has moved by more
+# than this factor from the count recorded in sqlite_stat1
+_STATS_DRIFT = 2
+
+# Rollup columns added after the initial daily_pnl schema
+_DAILY_ROLLUP_COLUMNS = {
+    "winner_pnl_sum": "REAL DEFAULT 0",
+    "loser_pnl_sum": "REAL DEFAULT 0",
+    "hold_min_sum": "INTEGER DEFAULT 0",
+}
+
 
 class ExecutionStore:
     """SQLite storage for execution state and history."""
@@ -26,22 +134,117 @@ class ExecutionStore:
     def __init__(self, config: DatabaseConfig):
         self.config = config
         self.db_path = Path(config.data_dir) / config.execution_db
+        self._in_memory = str(self.db_path).endswith(":memory:")
         self._conn: Optional[sqlite3.Connection] = None
+        # Serializes writers across threads/tasks; reads stay lock-free
+        self._write_lock = threading.Lock()
+        # Read-only connections, opened on demand (file databases only)
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._writes_since_ckpt = 0
 
     def connect(self) -> None:
-        """Connect to the database."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
+        """Connect to the database.
+
+        The connection runs in autocommit mode (isolation_level=None);
+        multi-statement writes open explicit transactions. File databases
+        use WAL so reads do not block on writes.
+        """
+        if self._in_memory:
+            self._conn = sqlite3.connect(
+                ":memory:",
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=256,
+            )
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=256,
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+            self._conn.execute(f"PRAGMA mmap_size={int(self.config.sqlite_mmap_size)}")
+            self._conn.execute("PRAGMA wal_autocheckpoint=1000")
         self._conn.row_factory = sqlite3.Row
         self._create_tables()
         logger.info(f"Connected to execution store: {self.db_path}")
 
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file."""
+        conn = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={int(self.config.sqlite_mmap_size)}")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool.
+
+        With WAL, readers on their own connections see the last committed
+        state and never wait on the writer. In-memory databases cannot be
+        shared across connections, so reads use the writer connection.
+        """
+        if self._in_memory:
+            yield self._conn
+            return
+
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+
+        try:
+            yield conn
+        finally:
+            if self._conn is not None and self._readers.qsize() < _READ_POOL_SIZE:
+                self._readers.put_nowait(conn)
+            else:
+                conn.close()
+
     def close(self) -> None:
-        """Close the database connection."""
+        """Close the database connections."""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
         if self._conn:
+            # Refresh planner statistics that went stale during the session
+            self._conn.execute("PRAGMA optimize")
             self._conn.close()
             self._conn = None
 
+    def _note_write(self) -> None:
+        """Count a committed write and truncate the WAL periodically.
+
+        Called with the write lock held. The automatic checkpoint copies
+        pages back but never shrinks the -wal file, so a long-running
+        process truncates it explicitly every _CHECKPOINT_EVERY writes.
+        """
+        self._writes_since_ckpt += 1
+        if self._writes_since_ckpt >= _CHECKPOINT_EVERY:
+            self._writes_since_ckpt = 0
+            if not self._in_memory:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def analyze(self) -> None:
+        """Recompute planner statistics (for periodic maintenance)."""
+        with self._write_lock:
+            self._conn.execute("ANALYZE")
+
     def _create_tables(self) -> None:
         """Create tables if they don't exist."""
         # Active position (singleton per symbol)
@@ -98,9 +301,13 @@ class ExecutionStore:
                 loss_count INTEGER DEFAULT 0,
                 fees_total REAL DEFAULT 0,
                 funding_total REAL DEFAULT 0,
+                winner_pnl_sum REAL DEFAULT 0,
+                loser_pnl_sum REAL DEFAULT 0,
+                hold_min_sum INTEGER DEFAULT 0,
                 PRIMARY KEY (date, symbol)
             )
         """)
+        self._migrate_daily_pnl()
 
         # Order tracking
         self._conn.execute("""
@@ -121,17 +328,71 @@ class ExecutionStore:
             )
         """)
 
+        # Serves symbol filter + exit_ts range + ORDER BY from one index
+        self._conn.execute("DROP INDEX IF EXISTS idx_trades_symbol")
+        self._conn.execute("DROP INDEX IF EXISTS idx_trades_ts")
         self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_symbol
-            ON trades (symbol)
+            CREATE INDEX IF NOT EXISTS idx_trades_sym_exit
+            ON trades (symbol, exit_ts DESC)
         """)
 
         self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_ts
-            ON trades (exit_ts)
+            CREATE INDEX IF NOT EXISTS idx_daily_sym_date
+            ON daily_pnl (symbol, date)
         """)
 
-        self._conn.commit()
+        # Give the planner statistics on first open, and refresh them once
+        # the trades table has outgrown (or shrunk well below) what they
+        # describe. An empty table leaves no sqlite_stat1 row, so a fresh
+        # database is re-analyzed on later opens once trades exist.
+        has_stats = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        stat = has_stats and self._conn.execute(
+            "SELECT stat FROM sqlite_stat1 WHERE idx = 'idx_trades_sym_exit'"
+        ).fetchone()
+        analyzed_rows = int(stat[0].split()[0]) if stat else 0
+        rows = self._conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+        if not has_stats or not (
+            analyzed_rows / _STATS_DRIFT <= rows <= analyzed_rows * _STATS_DRIFT
+        ):
+            self._conn.execute("ANALYZE")
+
+    def _migrate_daily_pnl(self) -> None:
+        """Add and backfill rollup columns on databases from older versions."""
+        existing = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(daily_pnl)")
+        }
+        missing = [c for c in _DAILY_ROLLUP_COLUMNS if c not in existing]
+        if not missing:
+            return
+
+        with self._write_lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for column in missing:
+                self._conn.execute(
+                    f"ALTER TABLE daily_pnl ADD COLUMN {column} "
+                    f"{_DAILY_ROLLUP_COLUMNS[column]}"
+                )
+            self._conn.execute("""
+                UPDATE daily_pnl SET
+                    winner_pnl_sum = COALESCE((
+                        SELECT SUM(t.pnl_net) FROM trades t
+                        WHERE t.symbol = daily_pnl.symbol AND t.pnl_net > 0
+                          AND date(t.exit_ts / 1000, 'unixepoch') = daily_pnl.date
+                    ), 0),
+                    loser_pnl_sum = COALESCE((
+                        SELECT SUM(t.pnl_net) FROM trades t
+                        WHERE t.symbol = daily_pnl.symbol AND t.pnl_net <= 0
+                          AND date(t.exit_ts / 1000, 'unixepoch') = daily_pnl.date
+                    ), 0),
+                    hold_min_sum = COALESCE((
+                        SELECT SUM(t.hold_minutes) FROM trades t
+                        WHERE t.symbol = daily_pnl.symbol
+                          AND date(t.exit_ts / 1000, 'unixepoch') = daily_pnl.date
+                    ), 0)
+            """)
+        logger.info(f"Migrated daily_pnl rollup columns: {', '.join(missing)}")
 
     # -------------------------------------------------------------------------
     # Position Management
@@ -139,37 +400,31 @@ class ExecutionStore:
 
     def save_position(self, position: Position, symbol: str) -> None:
         """Save or update the active position."""
-        self._conn.execute("""
-            INSERT OR REPLACE INTO positions (
-                symbol, entry_ts, side, entry_price, size, original_size,
-                stop_price, tp1_price, tp2_price, tp1_hit, strategy_tag,
-                fees_paid, funding_paid, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, [
-            symbol,
-            position.entry_ts,
-            position.side.name,
-            position.entry_price,
-            position.size,
-            position.original_size,
-            position.stop_price,
-            position.tp1_price,
-            position.tp2_price,
-            1 if position.tp1_hit else 0,
-            position.strategy_tag,
-            position.fees_paid,
-            position.funding_paid,
-            datetime.utcnow().isoformat(),
-        ])
-        self._conn.commit()
+        with self._write_lock:
+            self._conn.execute(_SQL_SAVE_POS, [
+                symbol,
+                position.entry_ts,
+                position.side.name,
+                position.entry_price,
+                position.size,
+                position.original_size,
+                position.stop_price,
+                position.tp1_price,
+                position.tp2_price,
+                1 if position.tp1_hit else 0,
+                position.strategy_tag,
+                position.fees_paid,
+                position.funding_paid,
+            ])
+            self._note_write()
 
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get the active position for a symbol."""
-        cursor = self._conn.execute(
-            "SELECT * FROM positions WHERE symbol = ?",
-            [symbol]
-        )
-        row = cursor.fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(
+                "SELECT * FROM positions WHERE symbol = ?",
+                [symbol]
+            ).fetchone()
 
         if not row:
             return None
@@ -191,43 +446,46 @@ class ExecutionStore:
 
     def delete_position(self, symbol: str) -> None:
         """Delete the active position."""
-        self._conn.execute("DELETE FROM positions WHERE symbol = ?", [symbol])
-        self._conn.commit()
+        with self._write_lock:
+            self._conn.execute("DELETE FROM positions WHERE symbol = ?", [symbol])
+            self._note_write()
 
     # -------------------------------------------------------------------------
     # Trade History
     # -------------------------------------------------------------------------
 
     def save_trade(self, trade: TradeRecord, symbol: str) -> int:
-        """Save a completed trade."""
-        cursor = self._conn.execute("""
-            INSERT INTO trades (
-                symbol, entry_ts, exit_ts, side, entry_price, exit_price,
-                size, pnl_gross, pnl_net, fees, funding, exit_reason,
-                strategy_tag, hold_minutes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, [
-            symbol,
-            trade.entry_ts,
-            trade.exit_ts,
-            trade.side.name,
-            trade.entry_price,
-            trade.exit_price,
-            trade.size,
-            trade.pnl_gross,
-            trade.pnl_net,
-            trade.fees,
-            trade.funding,
-            trade.exit_reason.name,
-            trade.strategy_tag,
-            trade.hold_minutes,
-        ])
-        self._conn.commit()
-
-        # Update daily P&L
-        self._update_daily_pnl(trade, symbol)
+        """Save a completed trade.
 
-        return cursor.lastrowid
+        The trade row and its daily P&L update are committed together in
+        one transaction (a single fsync per trade).
+        """
+        with self._write_lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                trade_id = self._conn.execute(_SQL_INSERT_TRADE, [
+                    symbol,
+                    trade.entry_ts,
+                    trade.exit_ts,
+                    trade.side.name,
+                    trade.entry_price,
+                    trade.exit_price,
+                    trade.size,
+                    trade.pnl_gross,
+                    trade.pnl_net,
+                    trade.fees,
+                    trade.funding,
+                    trade.exit_reason.name,
+                    trade.strategy_tag,
+                    trade.hold_minutes,
+                ]).fetchone()[0]
+
+                # Update daily P&L in the same transaction
+                self._update_daily_pnl(trade, symbol)
+
+            self._note_write()
+
+        return trade_id
 
     def get_trades(
         self,
@@ -251,10 +509,11 @@ class ExecutionStore:
         query += " ORDER BY exit_ts DESC"
 
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(limit)
 
-        cursor = self._conn.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        with self._read_conn() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
 
     def get_trade_stats(
         self,
@@ -262,7 +521,17 @@ class ExecutionStore:
         start_ts: Optional[int] = None,
         end_ts: Optional[int] = None,
     ) -> dict:
-        """Calculate trading statistics."""
+        """Calculate trading statistics.
+
+        Unbounded queries read the daily_pnl rollup maintained by
+        save_trade; time-bounded queries aggregate the trades table since
+        the rollup only has day granularity.
+        """
+        if not start_ts and not end_ts:
+            with self._read_conn() as conn:
+                row = conn.execute(_SQL_TRADE_STATS_ROLLUP, [symbol]).fetchone()
+            return self._format_trade_stats(row)
+
         query = """
             SELECT
                 COUNT(*) as total_trades,
@@ -291,10 +560,14 @@ class ExecutionStore:
                 query = query.replace("WHERE symbol = ?", "WHERE symbol = ? AND exit_ts <= ?")
             params.append(end_ts)
 
-        cursor = self._conn.execute(query, params)
-        row = cursor.fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(query, params).fetchone()
+        return self._format_trade_stats(row)
 
-        if not row or row["total_trades"] == 0:
+    @staticmethod
+    def _format_trade_stats(row: Optional[sqlite3.Row]) -> dict:
+        """Build the trade stats dict from an aggregate row."""
+        if not row or not row["total_trades"]:
             return {
                 "total_trades": 0,
                 "win_rate": 0.0,
@@ -321,27 +594,20 @@ class ExecutionStore:
     # -------------------------------------------------------------------------
 
     def _update_daily_pnl(self, trade: TradeRecord, symbol: str) -> None:
-        """Update daily P&L after a trade."""
-        date = datetime.utcfromtimestamp(trade.exit_ts / 1000).strftime("%Y-%m-%d")
+        """Update daily P&L after a trade.
+
+        Runs inside save_trade's transaction with the write lock held.
+        """
+        day = _day_to_date_str(trade.exit_ts // _MS_PER_DAY)
         is_winner = trade.pnl_net > 0
 
-        self._conn.execute("""
-            INSERT INTO daily_pnl (date, symbol, realized_pnl, trades_count, win_count, loss_count, fees_total, funding_total)
-            VALUES (?, ?, ?, 1, ?, ?, ?, ?)
-            ON CONFLICT(date, symbol) DO UPDATE SET
-                realized_pnl = realized_pnl + ?,
-                trades_count = trades_count + 1,
-                win_count = win_count + ?,
-                loss_count = loss_count + ?,
-                fees_total = fees_total + ?,
-                funding_total = funding_total + ?
-        """, [
-            date, symbol, trade.pnl_net, 1 if is_winner else 0, 0 if is_winner else 1,
-            trade.fees, trade.funding,
-            trade.pnl_net, 1 if is_winner else 0, 0 if is_winner else 1,
+        self._conn.execute(_SQL_UPSERT_DAILY, [
+            day, symbol, trade.pnl_net, 1 if is_winner else 0, 0 if is_winner else 1,
             trade.fees, trade.funding,
+            trade.pnl_net if is_winner else 0.0,
+            0.0 if is_winner else trade.pnl_net,
+            trade.hold_minutes,
         ])
-        self._conn.commit()
 
     def get_daily_pnl(
         self,
@@ -363,22 +629,17 @@ class ExecutionStore:
 
         query += " ORDER BY date ASC"
 
-        cursor = self._conn.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        with self._read_conn() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
 
     def get_equity_curve(self, symbol: str, initial_capital: float) -> List[dict]:
-        """Calculate equity curve from trade history."""
-        trades = self.get_trades(symbol)
-        trades.reverse()  # Oldest first
-
-        equity = initial_capital
-        curve = [{"ts": 0, "equity": equity}]
-
-        for trade in trades:
-            equity += trade["pnl_net"]
-            curve.append({
-                "ts": trade["exit_ts"],
-                "equity": equity,
-            })
+        """Calculate equity curve from trade history.
 
+        The running sum is computed by SQLite with a window function, so
+        no per-trade rows are materialized as dicts.
+        """
+        curve = [{"ts": 0, "equity": initial_capital}]
+        with self._read_conn() as conn:
+            cursor = conn.execute(_SQL_EQUITY_CURVE, [initial_capital, symbol])
+            curve.extend({"ts": ts, "equity": equity} for ts, equity in cursor)
         return curve
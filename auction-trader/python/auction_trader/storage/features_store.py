@@ -5,14 +5,98 @@ Stores computed features for analysis and backtesting.
 
 import logging
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, List, Optional, Sequence
 import duckdb
+import numpy as np
 
 from ..config import DatabaseConfig
 from ..models.types import Features1m, ValueArea, OrderFlowMetrics
 
 logger = logging.getLogger(__name__)
 
+# features_1m columns in Features1m field order (everything except symbol)
+FEATURE_COLUMNS = (
+    "ts_min", "mid_close", "sigma_240", "bin_width",
+    "va_poc", "va_vah", "va_val", "va_coverage", "va_bin_count",
+    "va_total_volume", "va_is_valid",
+    "of_1m", "of_norm_1m", "of_total_volume", "of_buy_volume",
+    "of_sell_volume", "of_ambiguous_volume", "of_ambiguous_frac",
+    "qimb_close", "qimb_ema", "spread_avg_60m",
+)
+
+# Upsert in place: updates the existing row rather than DELETE + INSERT
+_SQL_INSERT_FEATURES = f"""
+    INSERT INTO features_1m (ts_min, symbol, {', '.join(FEATURE_COLUMNS[1:])})
+    VALUES ({', '.join(['?'] * (len(FEATURE_COLUMNS) + 1))})
+    ON CONFLICT (ts_min, symbol) DO UPDATE SET
+        {', '.join(f'{c} = excluded.{c}' for c in FEATURE_COLUMNS[1:])}
+"""
+
+_SQL_SELECT_FEATURES = f"SELECT {', '.join(FEATURE_COLUMNS)} FROM features_1m"
+
+# Latest row per symbol; MAX(ts_min) then a primary-key lookup, no sort
+_SQL_LATEST_FEATURES = _SQL_SELECT_FEATURES + """
+    WHERE symbol = ?
+      AND ts_min = (SELECT MAX(ts_min) FROM features_1m WHERE symbol = ?)
+"""
+
+# Closed trades joined to the features of their entry minute. Reads the
+# execution SQLite database attached as "execution".
+_SQL_JOIN_TRADES_FEATURES = """
+    SELECT
+        t.id AS trade_id, t.entry_ts, t.exit_ts, t.side, t.entry_price,
+        t.exit_price, t.size, t.pnl_net, t.hold_minutes, t.exit_reason,
+        f.ts_min, f.mid_close, f.sigma_240, f.va_poc, f.va_vah, f.va_val,
+        f.va_is_valid, f.of_1m, f.of_norm_1m, f.qimb_ema
+    FROM execution.trades t
+    JOIN features_1m f
+      ON f.symbol = t.symbol AND f.ts_min = (t.entry_ts // 60000) * 60000
+    WHERE t.symbol = ? AND t.exit_ts >= ? AND t.exit_ts <= ?
+    ORDER BY t.exit_ts, t.id
+"""
+
+
+def _row_to_features(row: tuple) -> Features1m:
+    """Build Features1m from a row selected with FEATURE_COLUMNS."""
+    (
+        ts_min, mid_close, sigma_240, bin_width,
+        va_poc, va_vah, va_val, va_coverage, va_bin_count,
+        va_total_volume, va_is_valid,
+        of_1m, of_norm_1m, of_total_volume, of_buy_volume,
+        of_sell_volume, of_ambiguous_volume, of_ambiguous_frac,
+        qimb_close, qimb_ema, spread_avg_60m,
+    ) = row
+    va = ValueArea(
+        poc=va_poc,
+        vah=va_vah,
+        val=va_val,
+        coverage=va_coverage,
+        bin_count=va_bin_count,
+        total_volume=va_total_volume,
+        bin_width=bin_width,
+        is_valid=va_is_valid,
+    )
+    of = OrderFlowMetrics(
+        of_1m=of_1m,
+        of_norm_1m=of_norm_1m,
+        total_volume=of_total_volume,
+        buy_volume=of_buy_volume,
+        sell_volume=of_sell_volume,
+        ambiguous_volume=of_ambiguous_volume,
+        ambiguous_frac=of_ambiguous_frac,
+    )
+    return Features1m(
+        ts_min=ts_min,
+        mid_close=mid_close,
+        sigma_240=sigma_240,
+        bin_width=bin_width,
+        va=va,
+        order_flow=of,
+        qimb_close=qimb_close,
+        qimb_ema=qimb_ema,
+        spread_avg_60m=spread_avg_60m,
+    )
+
 
 class FeaturesStore:
     """DuckDB storage for computed features."""
@@ -21,11 +105,17 @@ class FeaturesStore:
         self.config = config
         self.db_path = Path(config.data_dir) / config.features_db
         self._conn: Optional[duckdb.DuckDBPyConnection] = None
+        self._execution_attached = False
 
     def connect(self) -> None:
         """Connect to the database."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = duckdb.connect(str(self.db_path))
+        settings = {}
+        if self.config.duckdb_memory_limit:
+            settings["memory_limit"] = self.config.duckdb_memory_limit
+        if self.config.duckdb_threads:
+            settings["threads"] = self.config.duckdb_threads
+        self._conn = duckdb.connect(str(self.db_path), config=settings)
         self._create_tables()
         logger.info(f"Connected to features store: {self.db_path}")
 
@@ -34,6 +124,7 @@ class FeaturesStore:
         if self._conn:
             self._conn.close()
             self._conn = None
+            self._execution_attached = False
 
     def _create_tables(self) -> None:
         """Create tables if they don't exist."""
@@ -79,14 +170,7 @@ class FeaturesStore:
         va = features.va
         of = features.order_flow
 
-        self._conn.execute("""
-            INSERT OR REPLACE INTO features_1m VALUES (
-                ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?
-            )
-        """, [
+        self._conn.execute(_SQL_INSERT_FEATURES, [
             features.ts_min, symbol, features.mid_close, features.sigma_240, features.bin_width,
             va.poc, va.vah, va.val, va.coverage, va.bin_count, va.total_volume, va.is_valid,
             of.of_1m, of.of_norm_1m, of.total_volume, of.buy_volume, of.sell_volume,
@@ -94,15 +178,14 @@ class FeaturesStore:
             features.qimb_close, features.qimb_ema, features.spread_avg_60m,
         ])
 
-    def get_features(
+    def _features_where(
         self,
         symbol: str,
-        start_ts: Optional[int] = None,
-        end_ts: Optional[int] = None,
-        limit: Optional[int] = None,
-    ) -> List[Features1m]:
-        """Query features with optional filters."""
-        query = "SELECT * FROM features_1m WHERE symbol = ?"
+        start_ts: Optional[int],
+        end_ts: Optional[int],
+    ) -> tuple:
+        """Build the WHERE/ORDER BY tail and params for a features query."""
+        query = " WHERE symbol = ?"
         params = [symbol]
 
         if start_ts:
@@ -114,52 +197,90 @@ class FeaturesStore:
             params.append(end_ts)
 
         query += " ORDER BY ts_min ASC"
+        return query, params
+
+    def get_features(
+        self,
+        symbol: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Features1m]:
+        """Query features with optional filters."""
+        where, params = self._features_where(symbol, start_ts, end_ts)
+        query = _SQL_SELECT_FEATURES + where
 
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(limit)
 
         result = self._conn.execute(query, params).fetchall()
 
-        features_list = []
-        for row in result:
-            va = ValueArea(
-                poc=row[5],
-                vah=row[6],
-                val=row[7],
-                coverage=row[8],
-                bin_count=row[9],
-                total_volume=row[10],
-                bin_width=row[4],
-                is_valid=row[11],
-            )
-            of = OrderFlowMetrics(
-                of_1m=row[12],
-                of_norm_1m=row[13],
-                total_volume=row[14],
-                buy_volume=row[15],
-                sell_volume=row[16],
-                ambiguous_volume=row[17],
-                ambiguous_frac=row[18],
-            )
-            features = Features1m(
-                ts_min=row[0],
-                mid_close=row[2],
-                sigma_240=row[3],
-                bin_width=row[4],
-                va=va,
-                order_flow=of,
-                qimb_close=row[19],
-                qimb_ema=row[20],
-                spread_avg_60m=row[21],
-            )
-            features_list.append(features)
+        return [_row_to_features(row) for row in result]
+
+    def get_features_columns(
+        self,
+        symbol: str,
+        columns: Sequence[str] = FEATURE_COLUMNS,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Query features as column arrays, for vectorized consumers.
+
+        Only the requested columns are read. Passing
+        signal_engine.BACKTEST_COLUMNS gives input for
+        SignalEngine.run_backtest without building Features1m objects.
+        """
+        unknown = set(columns) - set(FEATURE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown feature columns: {sorted(unknown)}")
 
-        return features_list
+        where, params = self._features_where(symbol, start_ts, end_ts)
+        query = f"SELECT {', '.join(columns)} FROM features_1m" + where
+        return self._conn.execute(query, params).fetchnumpy()
+
+    def attach_execution_db(self, path: Optional[str] = None) -> None:
+        """Attach the execution SQLite database read-only as "execution".
+
+        Uses DuckDB's sqlite extension (downloaded on first INSTALL).
+        Defaults to the execution_db configured next to this store.
+        """
+        if self._execution_attached:
+            return
+
+        if path is None:
+            path = str(Path(self.config.data_dir) / self.config.execution_db)
+        escaped = path.replace("'", "''")
+
+        self._conn.execute("INSTALL sqlite")
+        self._conn.execute("LOAD sqlite")
+        self._conn.execute(f"ATTACH '{escaped}' AS execution (TYPE SQLITE, READ_ONLY)")
+        self._execution_attached = True
+
+    def join_trades_features(
+        self,
+        symbol: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Join closed trades with the features at their entry minute.
+
+        The join runs inside DuckDB against the attached execution
+        database, returning column arrays rather than Python rows.
+        Attaches the configured execution database on first use.
+        """
+        self.attach_execution_db()
+        params = [
+            symbol,
+            start_ts if start_ts else 0,
+            end_ts if end_ts else 2**63 - 1,
+        ]
+        return self._conn.execute(_SQL_JOIN_TRADES_FEATURES, params).fetchnumpy()
 
     def get_latest_features(self, symbol: str) -> Optional[Features1m]:
         """Get the most recent features."""
-        features = self.get_features(symbol, limit=1)
-        return features[0] if features else None
+        row = self._conn.execute(_SQL_LATEST_FEATURES, [symbol, symbol]).fetchone()
+        return _row_to_features(row) if row else None
 
     def get_va_history(
         self,
@@ -188,5 +309,6 @@ class FeaturesStore:
         ]
 
     def vacuum(self) -> None:
-        """Optimize the database."""
+        """Optimize the database and refresh planner statistics."""
         self._conn.execute("VACUUM")
+        self._conn.execute("ANALYZE")
@@ -7,15 +7,53 @@ Stores:
 """
 
 import logging
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
 import duckdb
+import numpy as np
 
 from ..config import DatabaseConfig
 from ..models.types import Trade, Quote, Bar1m
 
 logger = logging.getLogger(__name__)
 
+# bars_1m columns in Bar1m field order (everything except symbol)
+BAR_COLUMNS = (
+    "ts_min", "open", "high", "low", "close", "volume", "vwap", "trade_count",
+    "bid_px_close", "ask_px_close", "bid_sz_close", "ask_sz_close",
+)
+
+# Upserts update the existing row in place rather than DELETE + INSERT
+_SQL_INSERT_TRADE = """
+    INSERT INTO trades VALUES (?, ?, ?, ?)
+    ON CONFLICT (ts_ms, symbol) DO UPDATE SET
+        price = excluded.price, size = excluded.size
+"""
+_SQL_INSERT_QUOTE = """
+    INSERT INTO quotes VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (ts_ms, symbol) DO UPDATE SET
+        bid_px = excluded.bid_px, bid_sz = excluded.bid_sz,
+        ask_px = excluded.ask_px, ask_sz = excluded.ask_sz
+"""
+# The batch must not repeat a key (see _insert_trades_chunk)
+_SQL_INSERT_TRADES_BATCH = """
+    INSERT INTO trades SELECT ts_ms, price, size, ? FROM _trades_batch
+    ON CONFLICT (ts_ms, symbol) DO UPDATE SET
+        price = excluded.price, size = excluded.size
+"""
+_SQL_INSERT_BAR = f"""
+    INSERT INTO bars_1m VALUES ({', '.join(['?'] * (len(BAR_COLUMNS) + 1))})
+    ON CONFLICT (ts_min, symbol) DO UPDATE SET
+        {', '.join(f'{c} = excluded.{c}' for c in BAR_COLUMNS[1:])}
+"""
+
+_SQL_SELECT_BARS = f"SELECT {', '.join(BAR_COLUMNS)} FROM bars_1m"
+_SQL_SELECT_TRADES = "SELECT ts_ms, price, size FROM trades"
+
+# Trades staged per INSERT when streaming a backfill through insert_trades
+_TRADES_CHUNK_SIZE = 100_000
+
 
 class RawStore:
     """DuckDB storage for raw market data."""
@@ -28,7 +66,12 @@ class RawStore:
     def connect(self) -> None:
         """Connect to the database."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = duckdb.connect(str(self.db_path))
+        settings = {}
+        if self.config.duckdb_memory_limit:
+            settings["memory_limit"] = self.config.duckdb_memory_limit
+        if self.config.duckdb_threads:
+            settings["threads"] = self.config.duckdb_threads
+        self._conn = duckdb.connect(str(self.db_path), config=settings)
         self._create_tables()
         logger.info(f"Connected to raw store: {self.db_path}")
 
@@ -84,29 +127,66 @@ class RawStore:
     def insert_trade(self, trade: Trade, symbol: str) -> None:
         """Insert a single trade."""
         self._conn.execute(
-            "INSERT OR REPLACE INTO trades VALUES (?, ?, ?, ?)",
+            _SQL_INSERT_TRADE,
             [trade.ts_ms, trade.price, trade.size, symbol]
         )
 
-    def insert_trades(self, trades: List[Trade], symbol: str) -> None:
-        """Insert multiple trades."""
-        data = [(t.ts_ms, t.price, t.size, symbol) for t in trades]
-        self._conn.executemany(
-            "INSERT OR REPLACE INTO trades VALUES (?, ?, ?, ?)",
-            data
+    def insert_trades(self, trades: Iterable[Trade], symbol: str) -> None:
+        """Insert multiple trades.
+
+        Accepts any iterable, so large backfills can be streamed from a
+        generator. Trades are staged in chunks of NumPy columns and
+        appended with INSERT ... SELECT, so DuckDB ingests each chunk
+        column-wise instead of binding parameters row by row. All chunks
+        are written in one transaction.
+        """
+        it = iter(trades)
+        chunk = list(islice(it, _TRADES_CHUNK_SIZE))
+        if not chunk:
+            return
+
+        self._conn.execute("BEGIN TRANSACTION")
+        try:
+            while chunk:
+                self._insert_trades_chunk(chunk, symbol)
+                chunk = list(islice(it, _TRADES_CHUNK_SIZE))
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _insert_trades_chunk(self, trades: List[Trade], symbol: str) -> None:
+        """Append one chunk of trades via a registered column batch."""
+        n = len(trades)
+        ts = np.fromiter((t.ts_ms for t in trades), np.int64, n)
+        price = np.fromiter((t.price for t in trades), np.float64, n)
+        size = np.fromiter((t.size for t in trades), np.float64, n)
+
+        # Keep the last trade per timestamp, as row-by-row upserts would
+        _, first_in_reversed = np.unique(ts[::-1], return_index=True)
+        if first_in_reversed.size < n:
+            keep = n - 1 - first_in_reversed
+            ts, price, size = ts[keep], price[keep], size[keep]
+
+        self._conn.register(
+            "_trades_batch", {"ts_ms": ts, "price": price, "size": size}
         )
+        try:
+            self._conn.execute(_SQL_INSERT_TRADES_BATCH, [symbol])
+        finally:
+            self._conn.unregister("_trades_batch")
 
     def insert_quote(self, quote: Quote, symbol: str) -> None:
         """Insert a single quote."""
         self._conn.execute(
-            "INSERT OR REPLACE INTO quotes VALUES (?, ?, ?, ?, ?, ?)",
+            _SQL_INSERT_QUOTE,
             [quote.ts_ms, quote.bid_px, quote.bid_sz, quote.ask_px, quote.ask_sz, symbol]
         )
 
     def insert_bar(self, bar: Bar1m, symbol: str) -> None:
         """Insert a 1-minute bar."""
         self._conn.execute(
-            "INSERT OR REPLACE INTO bars_1m VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _SQL_INSERT_BAR,
             [
                 bar.ts_min, bar.open, bar.high, bar.low, bar.close,
                 bar.volume, bar.vwap, bar.trade_count,
@@ -115,78 +195,84 @@ class RawStore:
             ]
         )
 
-    def get_bars(
+    def _range_filter(
         self,
+        ts_col: str,
         symbol: str,
-        start_ts: Optional[int] = None,
-        end_ts: Optional[int] = None,
-        limit: Optional[int] = None,
-    ) -> List[Bar1m]:
-        """Query bars with optional filters."""
-        query = "SELECT * FROM bars_1m WHERE symbol = ?"
+        start_ts: Optional[int],
+        end_ts: Optional[int],
+        limit: Optional[int],
+    ) -> tuple:
+        """Build the WHERE/ORDER BY/LIMIT tail and params for a range query."""
+        query = " WHERE symbol = ?"
         params = [symbol]
 
         if start_ts:
-            query += " AND ts_min >= ?"
+            query += f" AND {ts_col} >= ?"
             params.append(start_ts)
 
         if end_ts:
-            query += " AND ts_min <= ?"
+            query += f" AND {ts_col} <= ?"
             params.append(end_ts)
 
-        query += " ORDER BY ts_min ASC"
+        query += f" ORDER BY {ts_col} ASC"
 
         if limit:
-            query += f" LIMIT {limit}"
-
-        result = self._conn.execute(query, params).fetchall()
-
-        return [
-            Bar1m(
-                ts_min=row[0],
-                open=row[1],
-                high=row[2],
-                low=row[3],
-                close=row[4],
-                volume=row[5],
-                vwap=row[6],
-                trade_count=row[7],
-                bid_px_close=row[8],
-                ask_px_close=row[9],
-                bid_sz_close=row[10],
-                ask_sz_close=row[11],
-            )
-            for row in result
-        ]
+            query += " LIMIT ?"
+            params.append(limit)
 
-    def get_trades(
+        return query, params
+
+    def get_bars(
         self,
         symbol: str,
         start_ts: Optional[int] = None,
         end_ts: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> List[Trade]:
-        """Query trades with optional filters."""
-        query = "SELECT ts_ms, price, size FROM trades WHERE symbol = ?"
-        params = [symbol]
-
-        if start_ts:
-            query += " AND ts_ms >= ?"
-            params.append(start_ts)
-
-        if end_ts:
-            query += " AND ts_ms <= ?"
-            params.append(end_ts)
-
-        query += " ORDER BY ts_ms ASC"
+    ) -> List[Bar1m]:
+        """Query bars with optional filters."""
+        where, params = self._range_filter("ts_min", symbol, start_ts, end_ts, limit)
+        result = self._conn.execute(_SQL_SELECT_BARS + where, params).fetchall()
+        return [Bar1m(*row) for row in result]
 
-        if limit:
-            query += f" LIMIT {limit}"
+    def get_bars_columns(
+        self,
+        symbol: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Query bars as column arrays keyed by BAR_COLUMNS names.
 
-        result = self._conn.execute(query, params).fetchall()
+        Avoids building a Bar1m per row for analytics consumers. Columns
+        holding NULLs (vwap on empty bars) come back as masked arrays.
+        """
+        where, params = self._range_filter("ts_min", symbol, start_ts, end_ts, limit)
+        return self._conn.execute(_SQL_SELECT_BARS + where, params).fetchnumpy()
 
+    def get_trades(
+        self,
+        symbol: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Trade]:
+        """Query trades with optional filters."""
+        where, params = self._range_filter("ts_ms", symbol, start_ts, end_ts, limit)
+        result = self._conn.execute(_SQL_SELECT_TRADES + where, params).fetchall()
         return [Trade(ts_ms=row[0], price=row[1], size=row[2]) for row in result]
 
+    def get_trades_columns(
+        self,
+        symbol: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Query trades as ts_ms/price/size column arrays."""
+        where, params = self._range_filter("ts_ms", symbol, start_ts, end_ts, limit)
+        return self._conn.execute(_SQL_SELECT_TRADES + where, params).fetchnumpy()
+
     def get_latest_bar_ts(self, symbol: str) -> Optional[int]:
         """Get the timestamp of the latest bar."""
         result = self._conn.execute(
@@ -197,5 +283,6 @@ class RawStore:
         return result[0] if result and result[0] else None
 
     def vacuum(self) -> None:
-        """Optimize the database."""
+        """Optimize the database and refresh planner statistics."""
         self._conn.execute("VACUUM")
+        self._conn.execute("ANALYZE")
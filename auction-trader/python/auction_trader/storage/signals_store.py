@@ -4,16 +4,182 @@ Stores generated trading signals for analysis and audit.
 """
 
 import logging
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Iterator, Optional, List, Sequence, Tuple
 import json
+import numpy as np
 
 from ..config import DatabaseConfig
-from ..models.types import Signal, SignalType, Action
+from ..models.types import Features1m, Signal, SignalType, Action
 
 logger = logging.getLogger(__name__)
 
+# SQLite 3.45+ stores features_json as JSONB (pre-parsed binary JSON) so
+# json_* queries on it skip re-parsing; reads convert back to text.
+_HAS_JSONB = sqlite3.sqlite_version_info >= (3, 45, 0)
+_TO_STORED_JSON = "jsonb" if _HAS_JSONB else ""
+_FEATURES_JSON_IN = f"{_TO_STORED_JSON}(?)"
+_FEATURES_JSON_OUT = "json(features_json)" if _HAS_JSONB else "features_json"
+
+# Constant SQL so the connection's statement cache reuses compiled
+# statements instead of re-preparing per call.
+_SQL_INSERT_SIGNAL = f"""
+    INSERT INTO signals (
+        ts_min, symbol, signal_type, action, stop_price, tp1_price,
+        tp2_price, size, strategy_tag, confidence, reason, features_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_FEATURES_JSON_IN})
+"""
+
+# Bulk path: the whole batch is bound as one JSON array of row objects and
+# exploded by json_each, so a single statement inserts every row.
+_SIGNAL_INSERT_COLUMNS = (
+    "ts_min", "symbol", "signal_type", "action", "stop_price", "tp1_price",
+    "tp2_price", "size", "strategy_tag", "confidence", "reason", "features_json",
+)
+_SQL_INSERT_SIGNALS_JSON = f"""
+    INSERT INTO signals ({', '.join(_SIGNAL_INSERT_COLUMNS)})
+    SELECT
+        {', '.join(f"json_extract(value, '$.{c}')" for c in _SIGNAL_INSERT_COLUMNS[:-1])},
+        {_TO_STORED_JSON}(json_extract(value, '$.features_json'))
+    FROM json_each(?)
+"""
+
+# Optional query filters, as bits of the key into the precomputed
+# statement variants below
+_F_START = 1
+_F_END = 2
+_F_TYPE = 4
+_F_LIMIT = 8
+
+_SQL_SELECT_SIGNALS = f"""
+    SELECT
+        id, ts_min, symbol, signal_type, action, stop_price, tp1_price,
+        tp2_price, size, strategy_tag, confidence, reason,
+        {_FEATURES_JSON_OUT} AS features_json, created_at
+    FROM signals"""
+
+
+def _signals_where(mask: int) -> str:
+    """WHERE clause for the filters set in mask (params bound in bit order)."""
+    sql = " WHERE symbol = ?"
+    if mask & _F_START:
+        sql += " AND ts_min >= ?"
+    if mask & _F_END:
+        sql += " AND ts_min <= ?"
+    if mask & _F_TYPE:
+        sql += " AND signal_type = ?"
+    return sql
+
+
+_SQL_GET_SIGNALS = {
+    mask: (
+        _SQL_SELECT_SIGNALS + _signals_where(mask) + " ORDER BY ts_min DESC"
+        + (" LIMIT ?" if mask & _F_LIMIT else "")
+    )
+    for mask in range(16)
+}
+
+# Served by idx_signals_symbol_ts as one index seek, no sort
+_SQL_LATEST_SIGNAL = (
+    _SQL_SELECT_SIGNALS + " WHERE symbol = ? ORDER BY ts_min DESC LIMIT 1"
+)
+
+_SQL_SIGNAL_COUNTS = {
+    mask: (
+        "SELECT signal_type, COUNT(*) as count FROM signals"
+        + _signals_where(mask) + " GROUP BY signal_type"
+    )
+    for mask in range((_F_START | _F_END) + 1)
+}
+
+# One bounded batch of old rows, located via idx_signals_symbol_ts
+_SQL_DELETE_OLD_SIGNALS = """
+    DELETE FROM signals WHERE id IN (
+        SELECT id FROM signals WHERE symbol = ? AND ts_min < ? LIMIT ?
+    )
+"""
+
+# Column dtypes for get_signals_columnar, in _SQL_GET_SIGNALS select order
+_SIGNAL_COLUMN_DTYPES = (
+    ("id", np.int64),
+    ("ts_min", np.int64),
+    ("symbol", object),
+    ("signal_type", object),
+    ("action", object),
+    ("stop_price", np.float64),
+    ("tp1_price", np.float64),
+    ("tp2_price", np.float64),
+    ("size", np.float64),
+    ("strategy_tag", object),
+    ("confidence", np.float64),
+    ("reason", object),
+    ("features_json", object),
+    ("created_at", object),
+)
+
+# insert_signals_bulk switches to the json_each path above this size
+_JSON_BATCH_MIN = 1000
+
+# Buffered insert_signal calls are committed once this many are pending,
+# or once the buffering transaction has been open this many seconds
+_FLUSH_EVERY = 100
+_FLUSH_AFTER_S = 1.0
+
+# Enum member -> stored name, so row building skips Enum.name lookups
+_SIGNAL_TYPE_NAMES = {st: st.name for st in SignalType}
+_ACTION_NAMES = {a: a.name for a in Action}
+
+# Rows removed per transaction by delete_old_signals
+_DELETE_BATCH = 10_000
+
+# Rows per fetchmany() batch when reading signals
+_FETCH_BATCH = 1000
+
+# Idle read-only connections kept open for reuse
+_READ_POOL_SIZE = 4
+
+
+def _features_to_json(fs: Features1m) -> str:
+    """Serialize the stored subset of a features snapshot."""
+    return json.dumps({
+        "ts_min": fs.ts_min,
+        "mid_close": fs.mid_close,
+        "sigma_240": fs.sigma_240,
+        "va_poc": fs.va.poc,
+        "va_vah": fs.va.vah,
+        "va_val": fs.va.val,
+        "of_1m": fs.order_flow.of_1m,
+        "of_norm_1m": fs.order_flow.of_norm_1m,
+        "qimb_ema": fs.qimb_ema,
+    }, separators=(",", ":"))
+
+
+# Features1m parameters are serialized by sqlite3 at bind time
+sqlite3.register_adapter(Features1m, _features_to_json)
+
+
+def _signal_row(signal: Signal, symbol: str) -> tuple:
+    """Build the _SQL_INSERT_SIGNAL parameters for a signal."""
+    return (
+        signal.ts_min,
+        symbol,
+        _SIGNAL_TYPE_NAMES.get(signal.signal_type),
+        _ACTION_NAMES[signal.action],
+        signal.stop_price,
+        signal.tp1_price,
+        signal.tp2_price,
+        signal.size,
+        signal.strategy_tag,
+        signal.confidence,
+        signal.reason,
+        signal.features_snapshot,
+    )
+
 
 class SignalsStore:
     """SQLite storage for trading signals."""
@@ -21,27 +187,126 @@ class SignalsStore:
     def __init__(self, config: DatabaseConfig):
         self.config = config
         self.db_path = Path(config.data_dir) / config.signals_db
-        self._conn: Optional[sqlite3.Connection] = None
+        self._in_memory = str(self.db_path).endswith(":memory:")
+        self._conn: Optional[sqlite3.Connection] = None  # Writer
+        self._pending = 0  # Inserted but not yet committed signals
+        # Serializes use of the writer connection across threads
+        self._write_lock = threading.Lock()
+        # Monotonic time by which the open buffer must be committed
+        self._flush_deadline: Optional[float] = None
+        # Wakes the flusher thread when a buffer opens or the store closes
+        self._flush_wakeup = threading.Condition(self._write_lock)
+        self._flusher: Optional[threading.Thread] = None
+        # Read-only connections, opened on demand (file databases only)
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
 
     def connect(self) -> None:
-        """Connect to the database."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
+        """Connect to the database.
+
+        File databases use WAL with synchronous=NORMAL, so commits do not
+        fsync and readers do not block the writer. Call close() on
+        shutdown to checkpoint the WAL back into the main file.
+
+        The writer runs in autocommit mode (isolation_level=None); writes
+        that span statements open their own BEGIN IMMEDIATE transaction,
+        taking the write lock up front rather than upgrading at commit.
+        """
+        if self._in_memory:
+            self._conn = sqlite3.connect(
+                ":memory:",
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.db_path),
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+            self._conn.execute(f"PRAGMA mmap_size={int(self.config.sqlite_mmap_size)}")
+            self._conn.execute("PRAGMA wal_autocheckpoint=1000")
         self._conn.row_factory = sqlite3.Row
         self._create_tables()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="signals-flusher", daemon=True
+        )
+        self._flusher.start()
         logger.info(f"Connected to signals store: {self.db_path}")
 
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file."""
+        conn = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={int(self.config.sqlite_mmap_size)}")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool.
+
+        Buffered signals are committed first so reads see every signal
+        inserted so far. In-memory databases cannot be shared across
+        connections, so reads use the writer connection.
+        """
+        if self._pending:
+            self.flush()
+
+        if self._in_memory:
+            yield self._conn
+            return
+
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+
+        try:
+            yield conn
+        finally:
+            if self._conn is not None and self._readers.qsize() < _READ_POOL_SIZE:
+                self._readers.put_nowait(conn)
+            else:
+                conn.close()
+
     def close(self) -> None:
-        """Close the database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Commit buffered signals and close the database connections."""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+        with self._write_lock:
+            if self._conn:
+                self._commit_pending()
+                self._conn.close()
+                self._conn = None
+                self._flush_wakeup.notify()
+
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
 
     def _create_tables(self) -> None:
         """Create tables if they don't exist."""
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS signals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 ts_min INTEGER NOT NULL,
                 symbol TEXT NOT NULL,
                 signal_type TEXT,
@@ -53,64 +318,145 @@ class SignalsStore:
                 strategy_tag TEXT,
                 confidence REAL,
                 reason TEXT,
-                features_json TEXT,
+                features_json BLOB,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
+        # Every query filters by symbol and orders/ranges on ts_min
+        self._conn.execute("DROP INDEX IF EXISTS idx_signals_ts")
+        self._conn.execute("DROP INDEX IF EXISTS idx_signals_symbol")
         self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_ts
-            ON signals (ts_min)
+            CREATE INDEX IF NOT EXISTS idx_signals_symbol_ts
+            ON signals (symbol, ts_min DESC)
         """)
-
+        # Covers get_signal_counts, so GROUP BY signal_type streams off the
+        # index; ts_min also orders signal_type-filtered get_signals reads
         self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_symbol
-            ON signals (symbol)
+            CREATE INDEX IF NOT EXISTS idx_signals_symbol_type
+            ON signals (symbol, signal_type, ts_min DESC)
         """)
 
-        self._conn.commit()
-
     def insert_signal(self, signal: Signal, symbol: str) -> int:
-        """Insert a signal and return its ID."""
-        # Serialize features snapshot if present
-        features_json = None
-        if signal.features_snapshot:
-            fs = signal.features_snapshot
-            features_json = json.dumps({
-                "ts_min": fs.ts_min,
-                "mid_close": fs.mid_close,
-                "sigma_240": fs.sigma_240,
-                "va_poc": fs.va.poc,
-                "va_vah": fs.va.vah,
-                "va_val": fs.va.val,
-                "of_1m": fs.order_flow.of_1m,
-                "of_norm_1m": fs.order_flow.of_norm_1m,
-                "qimb_ema": fs.qimb_ema,
-            })
-
-        cursor = self._conn.execute("""
-            INSERT INTO signals (
-                ts_min, symbol, signal_type, action, stop_price, tp1_price,
-                tp2_price, size, strategy_tag, confidence, reason, features_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, [
-            signal.ts_min,
-            symbol,
-            signal.signal_type.name if signal.signal_type else None,
-            signal.action.name,
-            signal.stop_price,
-            signal.tp1_price,
-            signal.tp2_price,
-            signal.size,
-            signal.strategy_tag,
-            signal.confidence,
-            signal.reason,
-            features_json,
-        ])
-
-        self._conn.commit()
+        """Insert a signal and return its ID.
+
+        The insert is buffered in an open transaction and committed every
+        _FLUSH_EVERY signals, _FLUSH_AFTER_S seconds after the transaction
+        opened (by the store's flusher thread), or by flush()/close().
+
+        The buffering transaction is BEGIN IMMEDIATE, so the database write
+        lock is held from the first buffered insert until that commit: up
+        to _FLUSH_AFTER_S (1s). Writes from other connections wait out that
+        window within their busy_timeout; reads are not blocked under WAL.
+        A crash loses at most the uncommitted buffer. Use
+        insert_signal_sync when the row must be durable on return.
+        """
+        row = _signal_row(signal, symbol)
+        with self._write_lock:
+            if not self._conn.in_transaction:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._flush_deadline = time.monotonic() + _FLUSH_AFTER_S
+                self._flush_wakeup.notify()
+            cursor = self._conn.execute(_SQL_INSERT_SIGNAL, row)
+            self._pending += 1
+            if self._pending >= _FLUSH_EVERY:
+                self._commit_pending()
         return cursor.lastrowid
 
+    def insert_signal_sync(self, signal: Signal, symbol: str) -> int:
+        """Insert a signal, commit immediately and return its ID.
+
+        With nothing buffered the insert autocommits on its own; otherwise
+        it joins the open transaction and commits with the buffer.
+        """
+        row = _signal_row(signal, symbol)
+        with self._write_lock:
+            cursor = self._conn.execute(_SQL_INSERT_SIGNAL, row)
+            self._commit_pending()
+        return cursor.lastrowid
+
+    def insert_signals_bulk(self, signals: Sequence[Tuple[Signal, str]]) -> None:
+        """Insert many (signal, symbol) pairs in a single transaction.
+
+        Batches larger than _JSON_BATCH_MIN go through insert_signals_json,
+        unless a price or confidence is NaN or infinite: JSON cannot carry
+        those, so such batches are bound row by row like smaller ones.
+        """
+        rows = [_signal_row(signal, symbol) for signal, symbol in signals]
+
+        if len(rows) > _JSON_BATCH_MIN:
+            try:
+                json_blob = json.dumps(
+                    [dict(zip(_SIGNAL_INSERT_COLUMNS, row)) for row in rows],
+                    default=_features_to_json,
+                    allow_nan=False,
+                )
+            except ValueError:
+                pass
+            else:
+                self.insert_signals_json(json_blob)
+                return
+
+        with self._write_lock, self._write_txn() as conn:
+            conn.executemany(_SQL_INSERT_SIGNAL, rows)
+
+    def insert_signals_json(self, json_blob: str) -> None:
+        """Insert a JSON array of signal rows in a single statement.
+
+        Each element is an object keyed by signals column name (ts_min,
+        symbol, signal_type, action, ..., features_json as a JSON string).
+        Binding one blob avoids per-row parameter binding and the
+        host-parameter limit. Prices must be finite (JSON has no NaN).
+        """
+        with self._write_lock, self._write_txn() as conn:
+            conn.execute(_SQL_INSERT_SIGNALS_JSON, [json_blob])
+
+    def flush(self) -> None:
+        """Commit any buffered signals."""
+        with self._write_lock:
+            if self._conn is not None:
+                self._commit_pending()
+
+    def _commit_pending(self) -> None:
+        """Commit buffered signals. Called with the write lock held."""
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+        self._pending = 0
+        self._flush_deadline = None
+
+    def _flush_loop(self) -> None:
+        """Flusher thread: commit each buffer once its deadline passes."""
+        with self._write_lock:
+            while self._conn is not None:
+                if self._flush_deadline is None:
+                    self._flush_wakeup.wait()
+                    continue
+                remaining = self._flush_deadline - time.monotonic()
+                if remaining > 0:
+                    self._flush_wakeup.wait(remaining)
+                    continue
+                try:
+                    self._commit_pending()
+                except sqlite3.Error:
+                    logger.exception("Failed to commit buffered signals")
+                    self._flush_deadline = time.monotonic() + _FLUSH_AFTER_S
+
+    @contextmanager
+    def _write_txn(self) -> Iterator[sqlite3.Connection]:
+        """Run writes in one BEGIN IMMEDIATE transaction.
+
+        Called with the write lock held. Buffered signals are committed
+        first, so a failing write only rolls back its own rows.
+        """
+        self._commit_pending()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
     def get_signals(
         self,
         symbol: str,
@@ -120,30 +466,89 @@ class SignalsStore:
         limit: Optional[int] = None,
     ) -> List[dict]:
         """Query signals with optional filters."""
-        query = "SELECT * FROM signals WHERE symbol = ?"
+        sql, params = self._signals_query(symbol, start_ts, end_ts, signal_type, limit)
+        with self._read_conn() as conn:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    def iter_signal_batches(
+        self,
+        symbol: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        signal_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = _FETCH_BATCH,
+    ) -> Iterator[List[sqlite3.Row]]:
+        """Stream get_signals results as lists of up to batch_size rows.
+
+        Lets long backtest windows be processed without materializing
+        every row at once. The read connection is held until the
+        iterator is exhausted or closed.
+        """
+        sql, params = self._signals_query(symbol, start_ts, end_ts, signal_type, limit)
+        with self._read_conn() as conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+
+    def get_signals_columnar(
+        self,
+        symbol: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        signal_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Query signals as one array per column, for analytics.
+
+        Same filters and ordering as get_signals. Numeric columns are
+        int64/float64 arrays (NULL prices become NaN); text columns are
+        object arrays. Rows are converted batch by batch, so no full
+        list of row tuples is built.
+        """
+        chunks = {name: [] for name, _ in _SIGNAL_COLUMN_DTYPES}
+        batches = self.iter_signal_batches(symbol, start_ts, end_ts, signal_type, limit)
+        for rows in batches:
+            for (name, dtype), values in zip(_SIGNAL_COLUMN_DTYPES, zip(*rows)):
+                chunks[name].append(np.array(values, dtype=dtype))
+
+        return {
+            name: np.concatenate(chunks[name]) if chunks[name] else np.empty(0, dtype)
+            for name, dtype in _SIGNAL_COLUMN_DTYPES
+        }
+
+    @staticmethod
+    def _signals_query(
+        symbol: str,
+        start_ts: Optional[int],
+        end_ts: Optional[int],
+        signal_type: Optional[str],
+        limit: Optional[int],
+    ) -> Tuple[str, list]:
+        """Pick the statement variant and params for the given filters."""
+        mask = 0
         params = [symbol]
 
         if start_ts:
-            query += " AND ts_min >= ?"
+            mask |= _F_START
             params.append(start_ts)
 
         if end_ts:
-            query += " AND ts_min <= ?"
+            mask |= _F_END
             params.append(end_ts)
 
         if signal_type:
-            query += " AND signal_type = ?"
+            mask |= _F_TYPE
             params.append(signal_type)
 
-        query += " ORDER BY ts_min DESC"
-
         if limit:
-            query += f" LIMIT {limit}"
+            mask |= _F_LIMIT
+            params.append(limit)
 
-        cursor = self._conn.execute(query, params)
-        rows = cursor.fetchall()
-
-        return [dict(row) for row in rows]
+        return _SQL_GET_SIGNALS[mask], params
 
     def get_signal_counts(
         self,
@@ -152,38 +557,41 @@ class SignalsStore:
         end_ts: Optional[int] = None,
     ) -> dict:
         """Get signal counts by type."""
-        query = """
-            SELECT signal_type, COUNT(*) as count
-            FROM signals
-            WHERE symbol = ?
-        """
+        mask = 0
         params = [symbol]
 
         if start_ts:
-            query += " AND ts_min >= ?"
+            mask |= _F_START
             params.append(start_ts)
 
         if end_ts:
-            query += " AND ts_min <= ?"
+            mask |= _F_END
             params.append(end_ts)
 
-        query += " GROUP BY signal_type"
-
-        cursor = self._conn.execute(query, params)
-        rows = cursor.fetchall()
+        with self._read_conn() as conn:
+            rows = conn.execute(_SQL_SIGNAL_COUNTS[mask], params).fetchall()
 
         return {row["signal_type"] or "HOLD": row["count"] for row in rows}
 
     def get_latest_signal(self, symbol: str) -> Optional[dict]:
         """Get the most recent signal."""
-        signals = self.get_signals(symbol, limit=1)
-        return signals[0] if signals else None
+        with self._read_conn() as conn:
+            row = conn.execute(_SQL_LATEST_SIGNAL, [symbol]).fetchone()
+        return dict(row) if row else None
 
     def delete_old_signals(self, before_ts: int, symbol: str) -> int:
-        """Delete signals older than a timestamp."""
-        cursor = self._conn.execute(
-            "DELETE FROM signals WHERE ts_min < ? AND symbol = ?",
-            [before_ts, symbol]
-        )
-        self._conn.commit()
-        return cursor.rowcount
+        """Delete signals older than a timestamp.
+
+        Rows go in batches of _DELETE_BATCH, each in its own transaction,
+        so a large prune never holds the write lock or grows the WAL
+        unboundedly. Returns the total number of rows deleted.
+        """
+        deleted = 0
+        while True:
+            with self._write_lock, self._write_txn() as conn:
+                cursor = conn.execute(
+                    _SQL_DELETE_OLD_SIGNALS, [symbol, before_ts, _DELETE_BATCH]
+                )
+            deleted += cursor.rowcount
+            if cursor.rowcount < _DELETE_BATCH:
+                return deleted
@@ -3,6 +3,7 @@
 import sys
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 # Add the python package to the path
@@ -24,6 +25,7 @@ from auction_trader.models.types import (
     PositionSide,
     AcceptanceState,
 )
+from auction_trader.services.position_manager import PositionManager
 
 
 @pytest.fixture
@@ -32,7 +34,11 @@ def sample_config() -> Config:
     return Config()
 
 
-@pytest.fixture
+# Sample data below is built once and shared across the session; tests
+# must not mutate it. sample_config stays per-test since tests tweak it.
+
+
+@pytest.fixture(scope="session")
 def sample_trade() -> Trade:
     """Create a sample trade."""
     return Trade(
@@ -42,7 +48,7 @@ def sample_trade() -> Trade:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_quote() -> Quote:
     """Create a sample quote."""
     return Quote(
@@ -54,7 +60,7 @@ def sample_quote() -> Quote:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_bar() -> Bar1m:
     """Create a sample 1-minute bar."""
     return Bar1m(
@@ -73,7 +79,7 @@ def sample_bar() -> Bar1m:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_value_area() -> ValueArea:
     """Create a sample Value Area."""
     return ValueArea(
@@ -88,7 +94,7 @@ def sample_value_area() -> ValueArea:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_order_flow() -> OrderFlowMetrics:
     """Create sample order flow metrics."""
     return OrderFlowMetrics(
@@ -102,7 +108,7 @@ def sample_order_flow() -> OrderFlowMetrics:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_features(sample_value_area, sample_order_flow) -> Features1m:
     """Create sample features."""
     return Features1m(
@@ -118,31 +124,61 @@ def sample_features(sample_value_area, sample_order_flow) -> Features1m:
     )
 
 
-@pytest.fixture
-def bar_history() -> list[Bar1m]:
-    """Create a list of bars for testing rolling calculations."""
-    bars = []
+@pytest.fixture(scope="session")
+def bar_history() -> tuple[Bar1m, ...]:
+    """Create a history of bars for testing rolling calculations.
+
+    Built once per session and returned as a tuple; copy it with list()
+    before mutating.
+    """
     base_ts = 1704067200000
     base_price = 42000.0
 
-    for i in range(300):
-        # Simulate some price movement
-        price_offset = (i % 20 - 10) * 5  # Oscillate around base
-        close = base_price + price_offset
-
-        bars.append(Bar1m(
-            ts_min=base_ts + i * 60_000,
-            open=close - 10,
-            high=close + 20,
-            low=close - 20,
-            close=close,
-            volume=10.0 + (i % 5),
-            vwap=close,
-            trade_count=100 + i % 50,
-            bid_px_close=close - 0.5,
-            ask_px_close=close + 0.5,
-            bid_sz_close=1.0,
-            ask_sz_close=1.0,
-        ))
-
-    return bars
+    # Simulate some price movement: oscillate around base
+    i = np.arange(300)
+    closes = base_price + (i % 20 - 10) * 5
+    ones = np.ones(300)
+
+    # .tolist() hands Bar1m plain Python ints/floats, not numpy scalars
+    columns = (
+        base_ts + i * 60_000,  # ts_min
+        closes - 10,           # open
+        closes + 20,           # high
+        closes - 20,           # low
+        closes,                # close
+        10.0 + i % 5,          # volume
+        closes,                # vwap
+        100 + i % 50,          # trade_count
+        closes - 0.5,          # bid_px_close
+        closes + 0.5,          # ask_px_close
+        ones,                  # bid_sz_close
+        ones,                  # ask_sz_close
+    )
+    return tuple(Bar1m(*row) for row in zip(*(c.tolist() for c in columns)))
+
+
+@pytest.fixture(scope="session")
+def pm_factory():
+    """Return a callable giving a shared PositionManager with a fresh position.
+
+    The manager is built once; each call resets it and installs a new
+    42000-entry position with the given side, stop, TP1 and tp1_hit.
+    """
+    pm = PositionManager(Config(), initial_capital=10000.0)
+
+    def make(side: PositionSide, stop: float, tp1: float, tp1_hit: bool = False):
+        pm.reset()
+        pm.position = Position(
+            entry_ts=1000,
+            side=side,
+            entry_price=42000.0,
+            size=0.1,
+            original_size=0.1,
+            stop_price=stop,
+            tp1_price=tp1,
+            tp2_price=2 * tp1 - 42000.0,
+            tp1_hit=tp1_hit,
+        )
+        return pm
+
+    return make
@@ -13,6 +13,7 @@ from auction_trader.config import (
     OrderFlowConfig,
     BacktestConfig,
     DatabaseConfig,
+    LogConfig,
     load_config,
 )
 
@@ -55,6 +56,16 @@ class TestDefaultConfig:
         assert config.use_limit_for_entry is True
         assert config.limit_order_timeout_minutes == 1
 
+    def test_default_database_config(self):
+        config = DatabaseConfig()
+        assert config.sqlite_mmap_size == 1 << 30
+        assert config.duckdb_memory_limit is None
+        assert config.duckdb_threads is None
+
+    def test_default_log_config(self):
+        config = LogConfig()
+        assert config.include_reasons is True
+
 
 class TestConfigFromDict:
     """Tests for Config.from_dict method."""
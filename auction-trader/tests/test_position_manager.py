@@ -67,71 +67,26 @@ class TestPositionSizing:
 class TestPriceCrossing:
     """Tests for price crossing detection."""
 
-    def test_stop_hit_long(self, sample_config):
-        pm = PositionManager(sample_config, initial_capital=10000.0)
-        pm.position = Position(
-            entry_ts=1000,
-            side=PositionSide.LONG,
-            entry_price=42000.0,
-            size=0.1,
-            original_size=0.1,
-            stop_price=41800.0,
-            tp1_price=42100.0,
-            tp2_price=42200.0,
-        )
-        # Low touches stop
-        assert pm._check_stop(high=42100.0, low=41750.0) is True
-        # Low doesn't reach stop
-        assert pm._check_stop(high=42100.0, low=41850.0) is False
-
-    def test_stop_hit_short(self, sample_config):
-        pm = PositionManager(sample_config, initial_capital=10000.0)
-        pm.position = Position(
-            entry_ts=1000,
-            side=PositionSide.SHORT,
-            entry_price=42000.0,
-            size=0.1,
-            original_size=0.1,
-            stop_price=42200.0,
-            tp1_price=41900.0,
-            tp2_price=41800.0,
-        )
-        # High touches stop
-        assert pm._check_stop(high=42250.0, low=41900.0) is True
-        # High doesn't reach stop
-        assert pm._check_stop(high=42150.0, low=41900.0) is False
-
-    def test_tp1_hit_long(self, sample_config):
-        pm = PositionManager(sample_config, initial_capital=10000.0)
-        pm.position = Position(
-            entry_ts=1000,
-            side=PositionSide.LONG,
-            entry_price=42000.0,
-            size=0.1,
-            original_size=0.1,
-            stop_price=41800.0,
-            tp1_price=42100.0,
-            tp2_price=42200.0,
-            tp1_hit=False,
-        )
-        # High reaches TP1
-        assert pm._check_tp1(high=42150.0, low=41950.0) is True
-
-    def test_tp1_not_triggered_twice(self, sample_config):
-        pm = PositionManager(sample_config, initial_capital=10000.0)
-        pm.position = Position(
-            entry_ts=1000,
-            side=PositionSide.LONG,
-            entry_price=42000.0,
-            size=0.1,
-            original_size=0.1,
-            stop_price=41800.0,
-            tp1_price=42100.0,
-            tp2_price=42200.0,
-            tp1_hit=True,  # Already hit
-        )
-        # Should not trigger again
-        assert pm._check_tp1(high=42150.0, low=41950.0) is False
+    @pytest.mark.parametrize("side, stop, high, low, expected", [
+        # Long: low touches stop / doesn't reach it
+        (PositionSide.LONG, 41800.0, 42100.0, 41750.0, True),
+        (PositionSide.LONG, 41800.0, 42100.0, 41850.0, False),
+        # Short: high touches stop / doesn't reach it
+        (PositionSide.SHORT, 42200.0, 42250.0, 41900.0, True),
+        (PositionSide.SHORT, 42200.0, 42150.0, 41900.0, False),
+    ])
+    def test_stop_hit(self, pm_factory, side, stop, high, low, expected):
+        tp1 = 42100.0 if side == PositionSide.LONG else 41900.0
+        pm = pm_factory(side, stop, tp1)
+        assert pm._check_stop(high=high, low=low) is expected
+
+    @pytest.mark.parametrize("tp1_hit, expected", [
+        (False, True),   # High reaches TP1
+        (True, False),   # Already hit, should not trigger again
+    ])
+    def test_tp1_hit_long(self, pm_factory, tp1_hit, expected):
+        pm = pm_factory(PositionSide.LONG, 41800.0, 42100.0, tp1_hit=tp1_hit)
+        assert pm._check_tp1(high=42150.0, low=41950.0) is expected
 
 
 class TestTimeStop:
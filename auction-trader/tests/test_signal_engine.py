@@ -1,5 +1,12 @@
 """Tests for the SignalEngine."""
 
+import math
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 from auction_trader.config import Config
 from auction_trader.models.types import (
@@ -10,7 +17,12 @@ from auction_trader.models.types import (
     ValueArea,
     OrderFlowMetrics,
 )
-from auction_trader.services.signal_engine import SignalEngine, PriceZone
+from auction_trader.services.signal_engine import (
+    SignalEngine,
+    PriceZone,
+    BACKTEST_SIGNAL_TYPES,
+    features_to_arrays,
+)
 
 
 class TestPriceZone:
@@ -150,6 +162,45 @@ class TestAcceptanceTracking:
         assert engine.acceptance.consecutive_above_vah == 0
 
 
+class TestSignalReasons:
+    """Tests for signal reason construction."""
+
+    def _run_breakin(self, config):
+        engine = SignalEngine(config)
+        va = ValueArea(
+            poc=42000.0, vah=42200.0, val=41800.0,
+            coverage=0.7, bin_count=20, total_volume=1000.0,
+            bin_width=10.0, is_valid=True,
+        )
+        of = OrderFlowMetrics(50.0, 0.5, 100, 75, 25, 0, 0)
+
+        # Below VAL, then back inside VA with buying flow
+        for i, mid in enumerate((41700.0, 42000.0)):
+            signal = engine.process(Features1m(
+                ts_min=1000 + i * 60_000,
+                mid_close=mid,
+                sigma_240=0.015,
+                bin_width=10.0,
+                va=va,
+                order_flow=of,
+                qimb_close=0.2,
+                qimb_ema=0.2,
+                spread_avg_60m=1.0,
+            ))
+        return signal
+
+    def test_reason_included_by_default(self, sample_config):
+        signal = self._run_breakin(sample_config)
+        assert signal.signal_type == SignalType.BREAKIN_LONG
+        assert "Break-in long" in signal.reason
+
+    def test_reason_skipped_when_disabled(self, sample_config):
+        sample_config.log.include_reasons = False
+        signal = self._run_breakin(sample_config)
+        assert signal.signal_type == SignalType.BREAKIN_LONG
+        assert signal.reason == ""
+
+
 class TestSignalPriority:
     """Tests for signal priority resolution."""
 
@@ -186,3 +237,80 @@ class TestCooldown:
     def test_no_cooldown_initially(self, sample_config):
         engine = SignalEngine(sample_config)
         assert engine._in_cooldown(1000) is False
+
+    def test_reset_clears_cooldown(self, sample_config):
+        engine = SignalEngine(sample_config)
+        engine.last_signal_ts = 1000
+        engine.reset()
+        assert engine._in_cooldown(1000) is False
+
+
+class TestBacktestKernel:
+    """Tests for the array-based backtest kernel."""
+
+    def _random_history(self, n: int, seed: int = 7) -> list:
+        rng = random.Random(seed)
+        va = ValueArea(
+            poc=42000.0, vah=42200.0, val=41800.0,
+            coverage=0.7, bin_count=20, total_volume=1000.0,
+            bin_width=10.0, is_valid=True,
+        )
+        history = []
+        mid = 42000.0
+        for i in range(n):
+            # Random walk that repeatedly crosses the VA boundaries
+            mid += rng.choice((-150.0, -50.0, 0.0, 50.0, 150.0))
+            mid = min(max(mid, 41500.0), 42500.0)
+            of_norm = rng.uniform(-0.6, 0.6)
+            history.append(Features1m(
+                ts_min=i * 60_000,
+                mid_close=mid,
+                sigma_240=0.015,
+                bin_width=10.0,
+                va=va if rng.random() > 0.02 else ValueArea.invalid(),
+                order_flow=OrderFlowMetrics(of_norm * 100, of_norm, 100, 50, 50, 0, 0),
+                qimb_close=0.0,
+                qimb_ema=rng.uniform(-0.3, 0.3),
+                spread_avg_60m=1.0,
+            ))
+        return history
+
+    def test_matches_per_bar_processing(self, sample_config):
+        history = self._random_history(2000)
+
+        engine = SignalEngine(sample_config)
+        expected = [engine.process(f) for f in history]
+
+        sig, stop, tp1, tp2 = SignalEngine(sample_config).run_backtest(
+            features_to_arrays(history)
+        )
+
+        assert any(s.action != Action.HOLD for s in expected)
+        for i, signal in enumerate(expected):
+            if signal.action == Action.HOLD:
+                assert sig[i] == -1
+                assert math.isnan(stop[i])
+            else:
+                assert BACKTEST_SIGNAL_TYPES[sig[i]] == signal.signal_type
+                assert SignalType(sig[i]) == signal.signal_type
+                assert stop[i] == pytest.approx(signal.stop_price)
+                assert tp1[i] == pytest.approx(signal.tp1_price)
+                assert tp2[i] == pytest.approx(signal.tp2_price)
+
+    def test_signal_codes_are_signal_type_values(self):
+        assert len(BACKTEST_SIGNAL_TYPES) == len(SignalType)
+        for code, signal_type in enumerate(BACKTEST_SIGNAL_TYPES):
+            assert signal_type.value == code
+
+    def test_package_import_does_not_load_numba(self):
+        # The kernel module, and numba with it, loads on first run_backtest
+        code = "import sys, auction_trader; sys.exit('numba' in sys.modules)"
+        env = {**os.environ, "PYTHONPATH": str(Path(__file__).parent.parent / "python")}
+        assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
+
+    def test_leaves_engine_state_untouched(self, sample_config):
+        engine = SignalEngine(sample_config)
+        engine.run_backtest(features_to_arrays(self._random_history(200)))
+        assert engine.last_signal_ts is None
+        assert engine.prev_zone is None
+        assert engine.acceptance.consecutive_above_vah == 0
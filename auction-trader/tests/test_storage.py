@@ -0,0 +1,474 @@
+"""Tests for the storage layer."""
+
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import replace
+from typing import Iterator
+
+import numpy as np
+import pytest
+from auction_trader.config import DatabaseConfig
+from auction_trader.models.types import (
+    Trade, Signal, SignalType, Action, Position, PositionSide,
+)
+from auction_trader.services.position_manager import ExitReason, TradeRecord
+from auction_trader.storage import ExecutionStore, FeaturesStore, RawStore, SignalsStore
+from auction_trader.storage import raw_store, signals_store
+from auction_trader.storage.execution_store import _READ_POOL_SIZE
+from auction_trader.storage.raw_store import BAR_COLUMNS
+
+DAY_MS = 86_400_000
+T0 = 1704067200000  # 2024-01-01 00:00:00 UTC
+
+
+@pytest.fixture
+def db_config(tmp_path) -> DatabaseConfig:
+    """Database config pointing every store at a fresh directory."""
+    return DatabaseConfig(data_dir=str(tmp_path))
+
+
+@pytest.fixture
+def raw_db(db_config) -> Iterator[RawStore]:
+    """Connected RawStore on a fresh database."""
+    store = RawStore(db_config)
+    store.connect()
+    yield store
+    store.close()
+
+
+def make_trade(exit_ts: int, pnl_net: float, hold_minutes: int = 10) -> TradeRecord:
+    """Create a closed trade with the given exit time and net P&L."""
+    return TradeRecord(
+        entry_ts=exit_ts - hold_minutes * 60_000,
+        exit_ts=exit_ts,
+        side=PositionSide.LONG,
+        entry_price=42000.0,
+        exit_price=42000.0 + pnl_net * 10,
+        size=0.1,
+        pnl_gross=pnl_net + 1.0,
+        pnl_net=pnl_net,
+        fees=1.0,
+        funding=0.25,
+        exit_reason=ExitReason.TP1,
+        strategy_tag="test",
+        hold_minutes=hold_minutes,
+    )
+
+
+TRADES = [
+    make_trade(1704067200000 + 60_000, 25.0, 5),
+    make_trade(1704067200000 + 120_000, -10.0, 12),
+    make_trade(1704067200000 + DAY_MS, 40.0, 30),
+    make_trade(1704067200000 + 2 * DAY_MS, -5.0, 3),
+    make_trade(1704067200000 + 2 * DAY_MS + 60_000, 0.0, 7),
+]
+
+
+def assert_stats_match(rollup: dict, aggregate: dict) -> None:
+    assert rollup.keys() == aggregate.keys()
+    for key, value in aggregate.items():
+        assert rollup[key] == pytest.approx(value), key
+
+
+class TestRawStore:
+    """Tests for RawStore."""
+
+    def test_insert_trades_keeps_last_duplicate(self, raw_db):
+        raw_db.insert_trades([
+            Trade(T0, 42000.0, 0.1),
+            Trade(T0 + 1, 42001.0, 0.2),
+            Trade(T0, 42002.0, 0.3),
+        ], "BTCUSDT")
+
+        assert raw_db.get_trades("BTCUSDT") == [
+            Trade(T0, 42002.0, 0.3),
+            Trade(T0 + 1, 42001.0, 0.2),
+        ]
+
+    def test_insert_trades_streams_chunks(self, raw_db, monkeypatch):
+        monkeypatch.setattr(raw_store, "_TRADES_CHUNK_SIZE", 3)
+        trades = [Trade(T0 + i, 42000.0 + i, 0.1) for i in range(10)]
+
+        # 11 trades make four chunks; the repeat of T0 lands in the last one
+        raw_db.insert_trades(iter(trades + [Trade(T0, 41000.0, 0.5)]), "BTCUSDT")
+
+        assert raw_db.get_trades("BTCUSDT") == [Trade(T0, 41000.0, 0.5)] + trades[1:]
+
+    def test_insert_trades_rolls_back_on_failure(self, raw_db, monkeypatch):
+        monkeypatch.setattr(raw_store, "_TRADES_CHUNK_SIZE", 3)
+        raw_db.insert_trade(Trade(T0 - 1, 42000.0, 0.1), "BTCUSDT")
+
+        def failing_stream():
+            for i in range(5):
+                yield Trade(T0 + i, 42000.0, 0.1)
+            raise RuntimeError("feed dropped")
+
+        with pytest.raises(RuntimeError):
+            raw_db.insert_trades(failing_stream(), "BTCUSDT")
+
+        # The chunk written before the failure is rolled back as well
+        assert raw_db.get_trades("BTCUSDT") == [Trade(T0 - 1, 42000.0, 0.1)]
+
+    def test_column_reads_match_row_reads(self, raw_db, sample_bar):
+        for i in range(4):
+            raw_db.insert_bar(replace(
+                sample_bar,
+                ts_min=sample_bar.ts_min + i * 60_000,
+                close=sample_bar.close + i,
+                vwap=None if i == 2 else sample_bar.vwap,
+            ), "BTCUSDT")
+        raw_db.insert_trades(
+            [Trade(T0 + i * 1000, 42000.0 + i, 0.1 * i) for i in range(5)], "BTCUSDT"
+        )
+
+        start, end = T0 + 60_000, T0 + 180_000
+        bars = raw_db.get_bars("BTCUSDT", start_ts=start, end_ts=end)
+        bar_columns = raw_db.get_bars_columns("BTCUSDT", start_ts=start, end_ts=end)
+        assert len(bars) == 3
+        assert list(bar_columns) == list(BAR_COLUMNS)
+        for name in BAR_COLUMNS:
+            # NULL vwap comes back masked, and tolist() maps it to None
+            assert bar_columns[name].tolist() == [getattr(b, name) for b in bars], name
+
+        trades = raw_db.get_trades("BTCUSDT", limit=3)
+        trade_columns = raw_db.get_trades_columns("BTCUSDT", limit=3)
+        assert list(trade_columns) == ["ts_ms", "price", "size"]
+        for name, column in trade_columns.items():
+            assert column.tolist() == [getattr(t, name) for t in trades], name
+
+    def test_upserts_overwrite_existing_rows(
+        self, raw_db, sample_trade, sample_quote, sample_bar
+    ):
+        trade = replace(sample_trade, price=43000.0, size=0.2)
+        quote = replace(sample_quote, bid_px=42999.5, ask_sz=3.0)
+        bar = replace(sample_bar, close=42075.0, vwap=None)
+        raw_db.insert_trade(sample_trade, "BTCUSDT")
+        raw_db.insert_trade(trade, "BTCUSDT")
+        raw_db.insert_quote(sample_quote, "BTCUSDT")
+        raw_db.insert_quote(quote, "BTCUSDT")
+        raw_db.insert_bar(sample_bar, "BTCUSDT")
+        raw_db.insert_bar(bar, "BTCUSDT")
+
+        assert raw_db.get_trades("BTCUSDT") == [trade]
+        assert raw_db.get_bars("BTCUSDT") == [bar]
+        assert raw_db._conn.execute(
+            "SELECT ts_ms, bid_px, bid_sz, ask_px, ask_sz FROM quotes"
+        ).fetchall() == [
+            (quote.ts_ms, quote.bid_px, quote.bid_sz, quote.ask_px, quote.ask_sz)
+        ]
+
+
+class TestFeaturesStore:
+    """Tests for FeaturesStore."""
+
+    def test_latest_features_is_newest_row(self, db_config, sample_features):
+        store = FeaturesStore(db_config)
+        store.connect()
+        try:
+            newer = replace(sample_features, ts_min=sample_features.ts_min + 60_000)
+            store.insert_features(newer, "BTCUSDT")
+            store.insert_features(sample_features, "BTCUSDT")
+
+            latest = store.get_latest_features("BTCUSDT")
+            assert latest is not None
+            assert latest.ts_min == newer.ts_min
+            assert store.get_latest_features("ETHUSDT") is None
+        finally:
+            store.close()
+
+    def test_insert_features_overwrites_row(self, db_config, sample_features):
+        store = FeaturesStore(db_config)
+        store.connect()
+        try:
+            updated = replace(sample_features, mid_close=42075.0, qimb_ema=-0.2)
+            store.insert_features(sample_features, "BTCUSDT")
+            store.insert_features(updated, "BTCUSDT")
+
+            (stored,) = store.get_features("BTCUSDT")
+            assert stored.mid_close == updated.mid_close
+            assert stored.qimb_ema == updated.qimb_ema
+        finally:
+            store.close()
+
+
+class TestExecutionStore:
+    """Tests for ExecutionStore."""
+
+    def test_save_position_overwrites_row(self, db_config):
+        position = Position(
+            entry_ts=1000,
+            side=PositionSide.LONG,
+            entry_price=42000.0,
+            size=0.1,
+            original_size=0.1,
+            stop_price=41900.0,
+            tp1_price=42100.0,
+            tp2_price=42200.0,
+        )
+        moved = replace(position, size=0.05, stop_price=42000.0, tp1_hit=True)
+        store = ExecutionStore(db_config)
+        store.connect()
+        try:
+            store.save_position(position, "BTCUSDT")
+            store.save_position(moved, "BTCUSDT")
+            assert store.get_position("BTCUSDT") == moved
+        finally:
+            store.close()
+
+    def test_rollup_stats_match_trades_aggregate(self, db_config):
+        store = ExecutionStore(db_config)
+        store.connect()
+        try:
+            for trade in TRADES:
+                store.save_trade(trade, "BTCUSDT")
+
+            # Unbounded stats read daily_pnl; any bound aggregates trades
+            rollup = store.get_trade_stats("BTCUSDT")
+            aggregate = store.get_trade_stats("BTCUSDT", start_ts=1)
+            assert rollup["total_trades"] == len(TRADES)
+            assert_stats_match(rollup, aggregate)
+        finally:
+            store.close()
+
+    def test_rollup_columns_backfilled_on_upgrade(self, db_config):
+        store = ExecutionStore(db_config)
+        store.connect()
+        for trade in TRADES:
+            store.save_trade(trade, "BTCUSDT")
+        expected = store.get_trade_stats("BTCUSDT", start_ts=1)
+        store.close()
+
+        # Strip the rollup columns, as in a database from an older version
+        conn = sqlite3.connect(store.db_path)
+        for column in ("winner_pnl_sum", "loser_pnl_sum", "hold_min_sum"):
+            conn.execute(f"ALTER TABLE daily_pnl DROP COLUMN {column}")
+        conn.commit()
+        conn.close()
+
+        store = ExecutionStore(db_config)
+        store.connect()
+        try:
+            assert_stats_match(store.get_trade_stats("BTCUSDT"), expected)
+        finally:
+            store.close()
+
+    def test_planner_stats_follow_trade_count(self, db_config):
+        def analyzed_rows(store):
+            stat = store._conn.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE idx = 'idx_trades_sym_exit'"
+            ).fetchone()
+            return stat and int(stat[0].split()[0])
+
+        # A new database is analyzed while still empty
+        store = ExecutionStore(db_config)
+        store.connect()
+        assert analyzed_rows(store) is None
+        for trade in TRADES:
+            store.save_trade(trade, "BTCUSDT")
+        store.close()
+
+        store = ExecutionStore(db_config)
+        store.connect()
+        try:
+            assert analyzed_rows(store) == len(TRADES)
+        finally:
+            store.close()
+
+    def test_equity_curve_matches_cumulative_loop(self, db_config):
+        # Saved out of exit order, with exit_ts ties and winners and losers
+        trades = [
+            make_trade(T0 + 120_000, 25.0),
+            make_trade(T0 + 60_000, -10.0),
+            make_trade(T0 + 120_000, -7.5),
+            make_trade(T0 + 120_000, 40.0),
+            make_trade(T0 + 180_000, 0.0),
+            make_trade(T0 + 60_000, 12.25),
+        ]
+        store = ExecutionStore(db_config)
+        store.connect()
+        try:
+            for trade in trades:
+                store.save_trade(trade, "BTCUSDT")
+            store.save_trade(make_trade(T0 + 90_000, 1000.0), "ETHUSDT")
+
+            # The per-trade loop the window query replaced; ties apply in
+            # save order (a stable sort keeps it)
+            equity = 10_000.0
+            expected = [{"ts": 0, "equity": equity}]
+            for trade in sorted(trades, key=lambda t: t.exit_ts):
+                equity += trade.pnl_net
+                expected.append({"ts": trade.exit_ts, "equity": equity})
+
+            curve = store.get_equity_curve("BTCUSDT", 10_000.0)
+            assert [p["ts"] for p in curve] == [p["ts"] for p in expected]
+            assert [p["equity"] for p in curve] == pytest.approx(
+                [p["equity"] for p in expected]
+            )
+        finally:
+            store.close()
+
+    def test_reads_use_bounded_pool(self, db_config):
+        store = ExecutionStore(db_config)
+        store.connect()
+        try:
+            store.save_trade(TRADES[0], "BTCUSDT")
+            for _ in range(_READ_POOL_SIZE + 2):
+                assert len(store.get_trades("BTCUSDT")) == 1
+
+            # Sequential reads reuse one pooled connection
+            assert store._readers.qsize() == 1
+
+            # Reads see writes committed after the reader was opened
+            store.save_trade(TRADES[1], "BTCUSDT")
+            assert len(store.get_trades("BTCUSDT")) == 2
+        finally:
+            store.close()
+        assert store._readers.qsize() == 0
+
+
+class TestSignalsStore:
+    """Tests for SignalsStore."""
+
+    def test_buffered_signals_visible_and_durable(self, db_config):
+        store = SignalsStore(db_config)
+        store.connect()
+        ids = [
+            store.insert_signal(
+                Signal(ts_min=i * 60_000, signal_type=SignalType.BREAKIN_LONG,
+                       action=Action.ENTER_LONG),
+                "BTCUSDT",
+            )
+            for i in range(3)
+        ]
+        assert ids == [1, 2, 3]
+
+        # Reads commit the buffer first
+        assert [s["id"] for s in store.get_signals("BTCUSDT")] == [3, 2, 1]
+
+        store.insert_signal(
+            Signal(ts_min=3 * 60_000, signal_type=None, action=Action.HOLD), "BTCUSDT"
+        )
+        store.close()
+
+        store = SignalsStore(db_config)
+        store.connect()
+        try:
+            assert store.get_signal_counts("BTCUSDT") == {"BREAKIN_LONG": 3, "HOLD": 1}
+        finally:
+            store.close()
+
+    @pytest.mark.parametrize("failing_write", ["bulk", "delete"])
+    def test_failed_write_keeps_buffered_signals(self, db_config, failing_write):
+        store = SignalsStore(db_config)
+        store.connect()
+        try:
+            ids = [
+                store.insert_signal(
+                    Signal(ts_min=i * 60_000, signal_type=None, action=Action.HOLD),
+                    "BTCUSDT",
+                )
+                for i in range(3)
+            ]
+            assert ids == [1, 2, 3]
+
+            with pytest.raises(sqlite3.Error):
+                if failing_write == "bulk":
+                    # ts_min is NOT NULL
+                    store.insert_signals_bulk([
+                        (Signal(ts_min=600_000, signal_type=None, action=Action.HOLD), "BTCUSDT"),
+                        (Signal(ts_min=None, signal_type=None, action=Action.HOLD), "BTCUSDT"),
+                    ])
+                else:
+                    store.delete_old_signals(b"not a timestamp", object())
+
+            assert [s["id"] for s in store.get_signals("BTCUSDT")] == [3, 2, 1]
+        finally:
+            store.close()
+
+    def test_buffered_signals_committed_after_time_bound(self, db_config, monkeypatch):
+        monkeypatch.setattr(signals_store, "_FLUSH_AFTER_S", 0.05)
+        store = SignalsStore(db_config)
+        store.connect()
+        flusher = store._flusher
+        try:
+            # Every buffering transaction is timed by the same thread
+            threads = threading.active_count()
+            for i in range(5):
+                store.insert_signal(
+                    Signal(ts_min=i, signal_type=None, action=Action.HOLD), "ETHUSDT"
+                )
+                store.flush()
+            assert threading.active_count() == threads
+
+            store.insert_signal(
+                Signal(ts_min=0, signal_type=None, action=Action.HOLD), "BTCUSDT"
+            )
+
+            # Another connection sees the row without any store call
+            other = sqlite3.connect(store.db_path, timeout=0)
+            try:
+                count = "SELECT COUNT(*) FROM signals WHERE symbol = 'BTCUSDT'"
+                deadline = time.monotonic() + 5.0
+                while time.monotonic() < deadline:
+                    if other.execute(count).fetchone()[0]:
+                        break
+                    time.sleep(0.01)
+                assert other.execute(count).fetchone()[0] == 1
+
+                # ...and the write lock has been released
+                other.execute("DELETE FROM signals")
+                other.commit()
+            finally:
+                other.close()
+            assert store._pending == 0
+        finally:
+            store.close()
+        assert not flusher.is_alive()
+
+    @pytest.mark.parametrize("stop_price", [41900.0, float("nan"), float("inf")])
+    def test_bulk_json_path_matches_executemany(
+        self, tmp_path, monkeypatch, sample_features, stop_price
+    ):
+        signals = [
+            (
+                Signal(
+                    ts_min=i * 60_000,
+                    signal_type=SignalType.BREAKOUT_LONG,
+                    action=Action.ENTER_LONG,
+                    stop_price=stop_price if i == 2 else 41900.0,
+                    tp1_price=42100.0,
+                    confidence=0.75,
+                    reason="test",
+                    features_snapshot=sample_features if i % 2 else None,
+                ),
+                "BTCUSDT",
+            )
+            for i in range(4)
+        ]
+        json_batches = []
+        insert_signals_json = SignalsStore.insert_signals_json
+        monkeypatch.setattr(
+            SignalsStore, "insert_signals_json",
+            lambda self, blob: json_batches.append(blob) or insert_signals_json(self, blob),
+        )
+
+        stored = {}
+        for path, batch_min in (("rows", len(signals)), ("json", 0)):
+            monkeypatch.setattr(signals_store, "_JSON_BATCH_MIN", batch_min)
+            store = SignalsStore(DatabaseConfig(data_dir=str(tmp_path / path)))
+            store.connect()
+            try:
+                store.insert_signals_bulk(signals)
+                stored[path] = [
+                    {k: v for k, v in s.items() if k != "created_at"}
+                    for s in store.get_signals("BTCUSDT")
+                ]
+            finally:
+                store.close()
+
+        # Non-finite prices can't be encoded as JSON and take the row path
+        assert len(json_batches) == int(math.isfinite(stop_price))
+        assert len(stored["rows"]) == len(signals)
+        np.testing.assert_equal(stored["json"], stored["rows"])
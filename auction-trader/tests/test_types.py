@@ -1,5 +1,8 @@
 """Tests for data types and models."""
 
+from dataclasses import FrozenInstanceError, replace
+
+import numpy as np
 import pytest
 from auction_trader.models.types import (
     Trade,
@@ -14,9 +17,21 @@ from auction_trader.models.types import (
     Position,
     PositionSide,
     AcceptanceState,
+    AcceptanceStateArray,
+    signal_priority,
     ts_to_minute,
     current_ts_ms,
 )
+from auction_trader.models.kernels import update_acceptance_batch, ts_to_minute_jit
+from auction_trader._jit import njit
+
+
+@njit(cache=True)
+def _minutes_loop(ts_ms):
+    out = np.empty_like(ts_ms)
+    for i in range(ts_ms.shape[0]):
+        out[i] = ts_to_minute_jit(ts_ms[i])
+    return out
 
 
 class TestTrade:
@@ -38,29 +53,53 @@ class TestTrade:
 class TestQuote:
     """Tests for Quote type."""
 
-    def test_create_quote(self):
+    def test_create_quote(self, sample_quote):
+        assert sample_quote.bid_px == 41999.5
+        assert sample_quote.ask_px == 42000.5
+
+    def test_quote_is_immutable(self, sample_quote):
+        with pytest.raises(FrozenInstanceError):
+            sample_quote.bid_px = 0.0
+        assert not hasattr(sample_quote, "__dict__")
+
+    @pytest.mark.parametrize("bid_px, bid_sz, ask_px, ask_sz, exp_mid, exp_spread, exp_imb", [
+        (41999.5, 1.5, 42000.5, 2.0, 42000.0, 1.0, (1.5 - 2.0) / (1.5 + 2.0)),
+        (41999.5, 3.0, 42000.5, 1.0, 42000.0, 1.0, 0.5),
+        (100.0, 1.0, 100.5, 1.0, 100.25, 0.5, 0.0),
+        (100.0, 0.0, 100.5, 0.0, 100.25, 0.5, 0.0),  # Empty book
+    ])
+    def test_quote_properties(
+        self, bid_px, bid_sz, ask_px, ask_sz, exp_mid, exp_spread, exp_imb
+    ):
         quote = Quote(
-            ts_ms=1000,
-            bid_px=41999.5,
-            bid_sz=1.5,
-            ask_px=42000.5,
-            ask_sz=2.0,
+            ts_ms=1000, bid_px=bid_px, bid_sz=bid_sz, ask_px=ask_px, ask_sz=ask_sz
+        )
+        assert quote.mid == exp_mid
+        assert quote.spread == exp_spread
+        assert abs(quote.imbalance - exp_imb) < 1e-10
+
+    def test_quote_batch_equivalence(self):
+        rng = np.random.default_rng(0)
+        n = 10_000
+        bid_px = 42000.0 + rng.normal(0, 50, n).round(1)
+        ask_px = bid_px + rng.integers(1, 10, n) * 0.5
+        bid_sz = rng.exponential(1.0, n)
+        ask_sz = rng.exponential(1.0, n)
+        bid_sz[:100] = 0.0
+        ask_sz[:50] = 0.0  # Some empty books
+
+        quotes = [
+            Quote(ts_ms=i, bid_px=b, bid_sz=bs, ask_px=a, ask_sz=as_)
+            for i, (b, bs, a, as_) in enumerate(zip(
+                bid_px.tolist(), bid_sz.tolist(), ask_px.tolist(), ask_sz.tolist()
+            ))
+        ]
+
+        assert np.allclose(Quote.batch_mid(bid_px, ask_px), [q.mid for q in quotes])
+        assert np.allclose(Quote.batch_spread(bid_px, ask_px), [q.spread for q in quotes])
+        assert np.allclose(
+            Quote.batch_imbalance(bid_sz, ask_sz), [q.imbalance for q in quotes]
         )
-        assert quote.bid_px == 41999.5
-        assert quote.ask_px == 42000.5
-
-    def test_quote_mid(self, sample_quote):
-        expected_mid = (41999.5 + 42000.5) / 2
-        assert sample_quote.mid == expected_mid
-
-    def test_quote_spread(self, sample_quote):
-        expected_spread = 42000.5 - 41999.5
-        assert sample_quote.spread == expected_spread
-
-    def test_quote_imbalance(self, sample_quote):
-        # bid_sz=1.5, ask_sz=2.0
-        expected_imb = (1.5 - 2.0) / (1.5 + 2.0)
-        assert abs(sample_quote.imbalance - expected_imb) < 1e-10
 
 
 class TestBar1m:
@@ -72,18 +111,29 @@ class TestBar1m:
         assert sample_bar.low == 41950.0
         assert sample_bar.close == 42050.0
 
-    def test_bar_mid_close(self, sample_bar):
-        expected = (42049.5 + 42050.5) / 2
-        assert sample_bar.mid_close == expected
-
-    def test_bar_spread_close(self, sample_bar):
-        expected = 42050.5 - 42049.5
-        assert sample_bar.spread_close == expected
-
-    def test_bar_qimb_close(self, sample_bar):
-        # bid_sz_close=1.0, ask_sz_close=1.2
-        expected = (1.0 - 1.2) / (1.0 + 1.2)
-        assert abs(sample_bar.qimb_close - expected) < 1e-10
+    def test_bar_is_immutable(self, sample_bar):
+        with pytest.raises(FrozenInstanceError):
+            sample_bar.close = 0.0
+        assert not hasattr(sample_bar, "__dict__")
+
+    @pytest.mark.parametrize("bid_px, bid_sz, ask_px, ask_sz, exp_mid, exp_spread, exp_qimb", [
+        (42049.5, 1.0, 42050.5, 1.2, 42050.0, 1.0, (1.0 - 1.2) / (1.0 + 1.2)),
+        (42049.5, 2.0, 42050.5, 2.0, 42050.0, 1.0, 0.0),
+        (100.0, 0.0, 100.5, 0.0, 100.25, 0.5, 0.0),  # Empty book
+    ])
+    def test_bar_close_properties(
+        self, sample_bar, bid_px, bid_sz, ask_px, ask_sz, exp_mid, exp_spread, exp_qimb
+    ):
+        bar = replace(
+            sample_bar,
+            bid_px_close=bid_px,
+            bid_sz_close=bid_sz,
+            ask_px_close=ask_px,
+            ask_sz_close=ask_sz,
+        )
+        assert bar.mid_close == exp_mid
+        assert bar.spread_close == exp_spread
+        assert abs(bar.qimb_close - exp_qimb) < 1e-10
 
 
 class TestValueArea:
@@ -99,6 +149,12 @@ class TestValueArea:
         va = ValueArea.invalid()
         assert va.is_valid is False
         assert va.poc == 0.0
+        assert ValueArea.invalid() is ValueArea.invalid()
+
+    def test_value_area_is_immutable(self, sample_value_area):
+        with pytest.raises(FrozenInstanceError):
+            sample_value_area.vah = 0.0
+        assert not hasattr(sample_value_area, "__dict__")
 
     def test_value_area_width(self, sample_value_area):
         # ValueArea doesn't have a width property, calculate it
@@ -118,6 +174,10 @@ class TestSignalType:
         assert SignalType.FAILED_BREAKOUT_LONG.priority < SignalType.BREAKOUT_LONG.priority
         assert SignalType.FAILED_BREAKOUT_LONG.priority > SignalType.BREAKIN_LONG.priority
 
+        assert signal_priority(SignalType.BREAKIN_LONG) < signal_priority(SignalType.BREAKOUT_LONG)
+        for st in SignalType:
+            assert signal_priority(st) == st.priority
+
     def test_is_long(self):
         assert SignalType.BREAKIN_LONG.is_long() is True
         assert SignalType.BREAKOUT_LONG.is_long() is True
@@ -125,6 +185,13 @@ class TestSignalType:
         assert SignalType.BREAKIN_SHORT.is_long() is False
         assert SignalType.BREAKOUT_SHORT.is_long() is False
 
+    def test_is_long_branchless_invariant(self):
+        # is_long() reads the low bit of the value; names must agree
+        for st in SignalType:
+            assert st.is_long() is st.name.endswith("_LONG")
+            assert st.is_short() is st.name.endswith("_SHORT")
+        assert sorted(st.value for st in SignalType) == list(range(len(SignalType)))
+
 
 class TestPosition:
     """Tests for Position type."""
@@ -173,6 +240,24 @@ class TestPosition:
         assert pos.is_profitable(41900.0) is True
         assert pos.is_profitable(42100.0) is False
 
+    @pytest.mark.parametrize("side", [PositionSide.LONG, PositionSide.SHORT])
+    def test_is_profitable_vectorized(self, side):
+        pos = Position(
+            entry_ts=1000,
+            side=side,
+            entry_price=42000.0,
+            size=0.1,
+            original_size=0.1,
+            stop_price=41800.0 if side == PositionSide.LONG else 42200.0,
+            tp1_price=None,
+            tp2_price=None,
+            fees_paid=1.5,
+        )
+        prices = np.linspace(41500.0, 42500.0, 1001)
+
+        pnl = (prices - pos.entry_price) * side.sign * pos.size - pos.fees_paid
+        assert np.array_equal(pnl > 0.0, [pos.is_profitable(p) for p in prices.tolist()])
+
 
 class TestAcceptanceState:
     """Tests for AcceptanceState."""
@@ -190,6 +275,55 @@ class TestAcceptanceState:
         assert state.consecutive_above_vah == 0
         assert state.locked_vah is None
 
+    def test_reset_above_vectorized(self):
+        n = 1000
+        states = AcceptanceStateArray(n)
+        states.consecutive_above_vah[:] = 5
+        states.locked_vah[:] = 42200.0
+        states.consecutive_below_val[:] = 2
+        mask = np.arange(n) % 2 == 0
+
+        states.reset_above(mask)
+
+        assert (states.consecutive_above_vah[mask] == 0).all()
+        assert np.isnan(states.locked_vah[mask]).all()
+        assert (states.consecutive_above_vah[~mask] == 5).all()
+        assert (states.locked_vah[~mask] == 42200.0).all()
+        assert (states.consecutive_below_val == 2).all()
+
+        assert states.state(0) == AcceptanceState(consecutive_below_val=2)
+        assert states.state(1) == AcceptanceState(
+            consecutive_above_vah=5, consecutive_below_val=2, locked_vah=42200.0
+        )
+
+    def test_update_batch(self):
+        # Symbol 0 holds above VAH, 1 flips above -> below, 2 goes back inside
+        states = AcceptanceStateArray(3)
+        vahs = np.array([110.0, 110.0, 110.0])
+        vals = np.array([90.0, 90.0, 90.0])
+
+        states.update(np.array([111.0, 111.0, 111.0]), vahs, vals)
+        states.update(np.array([112.0, 89.0, 100.0]), vahs + 1.0, vals)
+
+        assert states.state(0) == AcceptanceState(consecutive_above_vah=2, locked_vah=110.0)
+        assert states.state(1) == AcceptanceState(consecutive_below_val=1, locked_val=90.0)
+        assert states.state(2) == AcceptanceState()
+
+    def test_acceptance_numba_cached(self):
+        pytest.importorskip("numba")
+        states = AcceptanceStateArray(4)
+        closes = np.array([111.0, 89.0, 100.0, 120.0])
+        vahs = np.full(4, 110.0)
+        vals = np.full(4, 90.0)
+
+        states.update(closes, vahs, vals)
+        signatures = list(update_acceptance_batch.signatures)
+        assert signatures
+
+        # Same argument types reuse the compiled specialization
+        states.update(closes, vahs, vals)
+        assert list(update_acceptance_batch.signatures) == signatures
+
 
 class TestUtilityFunctions:
     """Tests for utility functions."""
@@ -205,7 +339,18 @@ class TestUtilityFunctions:
         minute_ts = ts_to_minute(ts_ms_offset)
         assert minute_ts == 1704067200000
 
+    def test_ts_to_minute_vectorized(self):
+        ts_ms = np.arange(0, 600_000, 1, dtype=np.int64)
+        expected = (ts_ms // 60_000) * 60_000
+        np.testing.assert_array_equal(_minutes_loop(ts_ms), expected)
+        assert ts_to_minute_jit(1704067230000) == ts_to_minute(1704067230000)
+
     def test_current_ts_ms(self):
         ts = current_ts_ms()
         # Should be a reasonable timestamp (after 2024)
         assert ts > 1704067200000
+
+        # Integer milliseconds, never going backwards between calls
+        stamps = [current_ts_ms() for _ in range(1000)]
+        assert all(type(t) is int for t in stamps)
+        assert all(a <= b for a, b in zip(stamps, stamps[1:]))